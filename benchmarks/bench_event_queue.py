@@ -0,0 +1,94 @@
+"""Measures event scheduling throughput of the simulator's event queue against queue depth.
+
+For each queue depth the queue is pre-filled with that many pending events, and then a steady state of one pop
+followed by one push is timed (this is what Simulate does for every event it processes). The original sorted-list
+implementation is included as a reference so the two can be compared side by side.
+
+Usage:
+    python benchmarks/bench_event_queue.py [--ops N] [--depths 10,100,1000,...]
+"""
+
+import os
+import random
+import sys
+import time
+from optparse import OptionParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from network_simulator import EventQueue, SimulatedEvent  # noqa: E402
+
+
+class SortedListQueue:
+    """The original linear-scan insert / pop(0) event list, kept here for comparison"""
+
+    def __init__(self):
+        self.event_list = []
+
+    def __len__(self):
+        return len(self.event_list)
+
+    def push(self, new_event):
+        if len(self.event_list) == 0:
+            self.event_list.append(new_event)
+        elif new_event.evtime < self.event_list[0].evtime:
+            self.event_list.insert(0, new_event)
+        elif new_event.evtime > self.event_list[-1].evtime:
+            self.event_list.append(new_event)
+        else:
+            for idx, e in enumerate(self.event_list):
+                if new_event.evtime < e.evtime:
+                    self.event_list.insert(idx, new_event)
+                    break
+
+    def pop(self):
+        return self.event_list.pop(0)
+
+
+def make_event(evtime):
+    event = SimulatedEvent()
+    event.evtime = evtime
+    return event
+
+
+def bench(queue_class, depth, ops, rng):
+    queue = queue_class()
+    for _ in range(depth):
+        queue.push(make_event(rng.uniform(0.0, depth)))
+
+    events = [make_event(0) for _ in range(ops)]
+    offsets = [rng.uniform(0.0, depth) for _ in range(ops)]
+
+    start = time.perf_counter()
+    for event, offset in zip(events, offsets):
+        now = queue.pop().evtime
+        event.evtime = now + offset
+        queue.push(event)
+    elapsed = time.perf_counter() - start
+
+    return ops / elapsed
+
+
+def main():
+    op = OptionParser(description="Event queue throughput benchmark")
+    op.add_option("--ops", metavar="X", type="int", default=20000, help="pop/push pairs to time per depth")
+    op.add_option(
+        "--depths",
+        metavar="X",
+        default="10,100,1000,10000",
+        help="comma separated list of queue depths",
+    )
+    op.add_option("--seed", metavar="X", type="int", default=1, help="The seed to use for random generation")
+    options, _ = op.parse_args()
+
+    depths = [int(d) for d in options.depths.split(",")]
+
+    print(f"{'depth':>8} {'heap events/s':>16} {'list events/s':>16} {'speedup':>9}")
+    for depth in depths:
+        heap_rate = bench(EventQueue, depth, options.ops, random.Random(options.seed))
+        list_rate = bench(SortedListQueue, depth, options.ops, random.Random(options.seed))
+        print(f"{depth:>8} {heap_rate:>16,.0f} {list_rate:>16,.0f} {heap_rate / list_rate:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Measures packet construction throughput before and after the single-pass packet builder.
+
+"before" is the original construction used by GBNHost: format a struct string, encode the payload, pack the packet
+with a zero checksum, checksum it word by word and pack it again. "after" is GBNHost.create_data_pkt and
+GBNHost.create_ack_pkt as they are now.
+
+Usage:
+    python benchmarks/bench_packet_builder.py [--pkts N] [--sizes 0,4,64,...]
+"""
+
+import os
+import sys
+import time
+from optparse import OptionParser
+from struct import pack
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from gbn_host import GBNHost  # noqa: E402
+
+
+def original_checksum(packet):
+    sum = 0
+    for i in range(0, len(packet), 2):
+        if i + 1 < len(packet):
+            word = (packet[i] << 8) + packet[i + 1]
+        else:
+            word = packet[i] << 8
+        sum = sum + word
+    while (sum >> 16) > 0:
+        sum = (sum & 0xFFFF) + (sum >> 16)
+    return ~sum & 0xFFFF
+
+
+def original_data_pkt(seq_num, payload):
+    payload_length = len(payload)
+    pkt_without_checksum = pack(
+        "!HIHI{}s".format(payload_length), 0x0, seq_num, 0, payload_length, payload.encode()
+    )
+    checksum = original_checksum(pkt_without_checksum)
+    return pack(
+        "!HIHI{}s".format(payload_length), 0x0, seq_num, checksum, payload_length, payload.encode()
+    )
+
+
+def original_ack_pkt(seq_num):
+    checksum = original_checksum(pack("!HIH", 0x1, seq_num, 0))
+    return pack("!HIH", 0x1, seq_num, checksum)
+
+
+def rate(build, args_list):
+    start = time.perf_counter()
+    for args in args_list:
+        build(*args)
+    return len(args_list) / (time.perf_counter() - start)
+
+
+def main():
+    op = OptionParser(description="Packet builder throughput benchmark")
+    op.add_option("--pkts", metavar="X", type="int", default=20000, help="packets to build per payload size")
+    op.add_option(
+        "--sizes",
+        metavar="X",
+        default="0,5,64,512,1400",
+        help="comma separated list of payload sizes in bytes",
+    )
+    options, _ = op.parse_args()
+
+    host = GBNHost(None, None, 10, 5)
+
+    print(f"{'payload':>8} {'before pkts/s':>15} {'after pkts/s':>15} {'speedup':>9}")
+    for size in [int(s) for s in options.sizes.split(",")]:
+        args_list = [(seq_num, chr(97 + seq_num % 26) * size) for seq_num in range(options.pkts)]
+        before = rate(original_data_pkt, args_list)
+        after = rate(host.create_data_pkt, args_list)
+        print(f"{size:>8} {before:>15,.0f} {after:>15,.0f} {after / before:>8.1f}x")
+
+    args_list = [(seq_num,) for seq_num in range(options.pkts)]
+    before = rate(original_ack_pkt, args_list)
+    after = rate(host.create_ack_pkt, args_list)
+    print(f"{'ACK':>8} {before:>15,.0f} {after:>15,.0f} {after / before:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Benchmark suite for the hot paths of the simulator and the hosts, with baselines to compare against.
+
+Microbenchmarks time single operations in a tight loop and report operations per second:
+    create_checksum, create_data_pkt, is_corrupt, unpack_pkt   GBNHost methods on a typical data packet
+    insert_event                                                NetworkSimulator.insert_event plus a pop, at a steady
+                                                                queue depth
+Macrobenchmarks run the twelve test case scenarios end to end with --num_pkts raised to the given number of packets,
+and report processed events per second and packets handed to the network layer per second.
+
+Results can be saved as a baseline JSON file, and a later run compared against it. Every benchmark whose rate fell by
+more than the tolerance is flagged, and the script then exits with status 1. Timings on a busy or shared machine can
+easily vary by 10-20%, so compare runs made on the same idle machine, or raise --tolerance.
+
+Usage:
+    python benchmarks/bench_suite.py [--num_pkts N] [--save baseline.json] [--compare baseline.json]
+"""
+
+import contextlib
+import glob
+import json
+import os
+import platform
+import re
+import sys
+import tempfile
+import time
+from optparse import OptionParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from gbn_host import GBNHost  # noqa: E402
+from network_simulator import NetworkSimulator, SimulatedEvent  # noqa: E402
+from rdt_tester import RDTTester  # noqa: E402
+
+TEST_CASES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests", "test_cases")
+
+
+def best_rate(operation, ops, repeat):
+    """The best rate, in operations per second, of repeat runs of ops calls to operation"""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(ops):
+            operation()
+        best = max(best, ops / (time.perf_counter() - start))
+    return best
+
+
+def micro_benchmarks(ops, repeat):
+    host = GBNHost(None, None, 10, 5)
+    packet = host.create_data_pkt(1234, "abcde")
+    checksummed = bytearray(packet)
+    checksummed[6:8] = b"\x00\x00"
+    checksummed = bytes(checksummed)
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            options, _ = RDTTester(GBNHost).op.parse_args(
+                "--num_pkts 0 --arrival_rate 1 --timer_interval 10 --loss_prob 0 --corrupt_prob 0 --seed 1".split()
+            )
+            simulator = NetworkSimulator(os.path.join(tmp, "bench"), options, GBNHost)
+
+        # Keep a steady queue of 100 pending events, like a busy simulation
+        for idx in range(100):
+            simulator.insert_event(SimulatedEvent(float(idx)))
+        event = SimulatedEvent()
+
+        def insert_event():
+            event.evtime = simulator.event_list.pop().evtime + 50.0
+            simulator.insert_event(event)
+
+        results = {
+            "create_checksum": best_rate(lambda: host.create_checksum(checksummed), ops, repeat),
+            "create_data_pkt": best_rate(lambda: host.create_data_pkt(1234, "abcde"), ops, repeat),
+            "is_corrupt": best_rate(lambda: host.is_corrupt(packet), ops, repeat),
+            "unpack_pkt": best_rate(lambda: host.unpack_pkt(packet), ops, repeat),
+            "insert_event": best_rate(insert_event, ops, repeat),
+        }
+        for log in (simulator.A_as_sender_log, simulator.B_as_sender_log):
+            log.close()
+    return results
+
+
+def macro_benchmarks(num_pkts, scenarios, repeat):
+    op = RDTTester(GBNHost).op
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        for scenario in scenarios:
+            with open(os.path.join(TEST_CASES, f"{scenario}.cfg")) as fp:
+                args = re.findall(r'(?:[^\s,"]|"(?:\\.|[^"])*")+', json.load(fp)["options"])
+            options, _ = op.parse_args(args + ["--num_pkts", str(num_pkts), "--event_log", "none"])
+
+            # Every repeat is the same seeded run, so the fastest one has the least interference
+            best = None
+            for _ in range(repeat):
+                with contextlib.redirect_stdout(devnull):
+                    start = time.perf_counter()
+                    simulator = NetworkSimulator(os.path.join(tmp, scenario), options, GBNHost)
+                    num_events = sum(1 for _ in simulator.iter_events())
+                    elapsed = time.perf_counter() - start
+                if best is None or elapsed < best:
+                    best = elapsed
+
+            results[scenario] = {
+                "events_per_sec": num_events / best,
+                "packets_per_sec": simulator.ntolayer3 / best,
+            }
+    return results
+
+
+def flatten(results):
+    """Flattens a results dictionary into {benchmark name: rate}"""
+    rates = {f"micro/{name}": rate for name, rate in results.get("micro", {}).items()}
+    for scenario, scenario_rates in results.get("macro", {}).items():
+        for name, rate in scenario_rates.items():
+            rates[f"macro/{scenario}/{name}"] = rate
+    return rates
+
+
+def compare(baseline, current, tolerance):
+    """Prints every benchmark's rate next to its baseline rate and flags the ones that got slower than the tolerance
+
+    Returns:
+        list: the names of the regressed benchmarks
+    """
+    baseline_rates = flatten(baseline)
+    current_rates = flatten(current)
+
+    regressions = []
+    width = max(len(name) for name in current_rates)
+    print(f"{'benchmark':<{width}} {'baseline/s':>14} {'current/s':>14} {'change':>8}")
+    for name, rate in current_rates.items():
+        if name not in baseline_rates:
+            print(f"{name:<{width}} {'-':>14} {rate:>14,.0f}")
+            continue
+
+        change = rate / baseline_rates[name] - 1
+        flag = ""
+        if change < -tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<{width}} {baseline_rates[name]:>14,.0f} {rate:>14,.0f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    op = OptionParser(description="Simulator and host benchmark suite")
+    op.add_option("--ops", metavar="X", type="int", default=50000, help="operations per microbenchmark run")
+    op.add_option("--repeat", metavar="X", type="int", default=5, help="microbenchmark runs, the best one counts")
+    op.add_option(
+        "--num_pkts",
+        metavar="X",
+        type="int",
+        default=100000,
+        help="packets per macrobenchmark scenario",
+    )
+    op.add_option("--macro_repeat", metavar="X", type="int", default=1, help="runs per scenario, the best one counts")
+    op.add_option(
+        "--scenarios",
+        metavar="X",
+        help="comma separated test cases to run as macrobenchmarks (default: all of them)",
+    )
+    op.add_option("--skip_micro", action="store_true", help="do not run the microbenchmarks")
+    op.add_option("--skip_macro", action="store_true", help="do not run the macrobenchmarks")
+    op.add_option("--save", metavar="FILE", help="save the results as a baseline")
+    op.add_option("--compare", metavar="FILE", help="compare the results against a saved baseline")
+    op.add_option(
+        "--tolerance",
+        metavar="X",
+        type="float",
+        default=0.1,
+        help="the slowdown (as a fraction of the baseline rate) flagged as a regression",
+    )
+    options, _ = op.parse_args()
+
+    if options.scenarios:
+        scenarios = options.scenarios.split(",")
+    else:
+        scenarios = sorted(
+            (os.path.basename(path)[: -len(".cfg")] for path in glob.glob(os.path.join(TEST_CASES, "*.cfg"))),
+            key=lambda name: int(re.match(r"Test(\d+)", name).group(1)),
+        )
+
+    results = {"python": platform.python_version(), "num_pkts": options.num_pkts}
+    if not options.skip_micro:
+        results["micro"] = micro_benchmarks(options.ops, options.repeat)
+    if not options.skip_macro:
+        results["macro"] = macro_benchmarks(options.num_pkts, scenarios, options.macro_repeat)
+
+    if options.save:
+        with open(options.save, "w") as fp:
+            json.dump(results, fp, indent=4)
+
+    if options.compare:
+        with open(options.compare) as fp:
+            baseline = json.load(fp)
+        if baseline.get("num_pkts") != options.num_pkts and "macro" in results:
+            print(f"WARNING: the baseline ran {baseline.get('num_pkts')} packets per scenario, not {options.num_pkts}")
+        if compare(baseline, results, options.tolerance):
+            sys.exit(1)
+    else:
+        for name, rate in flatten(results).items():
+            print(f"{name:<60} {rate:>14,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Compact binary trace of the simulator's log, formatted into the usual text logs on demand
+
+Writing the text logs means unpacking every logged packet and formatting a line for it while the simulation runs,
+several times per packet. In binary trace mode NetworkSimulator.print_to_log instead appends one fixed-size record
+per log line and leaves all formatting to decode_trace, which can be run after the simulation (or never).
+
+A trace named X consists of three files:
+    X.trace       fixed-size records: time (double), sending entity, event entity, message id, packet offset
+    X.trace.pkt   the logged packets, each prefixed with its length; records refer to them by offset
+    X.trace.msg   a JSON list of the distinct log messages; records refer to them by index
+
+Usage:
+    python binary_trace.py <trace name> [--protocol gbn|sr]
+"""
+
+import json
+import struct
+from optparse import OptionParser
+
+RECORD = struct.Struct("<dBBHI")
+PACKET_LENGTH = struct.Struct("<I")
+NO_PACKET = 0xFFFFFFFF
+
+# Buffer size of the trace files, so that records reach the disk in large writes
+BUFFER_SIZE = 1 << 20
+
+
+class BinaryTraceWriter:
+    def __init__(self, name):
+        self.name = name
+        self.records = open(f"{name}.trace", "wb", buffering=BUFFER_SIZE)
+        self.packets = open(f"{name}.trace.pkt", "wb", buffering=BUFFER_SIZE)
+        self.packets_size = 0
+        self.messages = {}
+
+        # The same packet is usually logged several times in a row (sent, lost, corrupted...), so it is only stored
+        # again when a different packet object is logged
+        self.last_packet = None
+        self.last_packet_offset = NO_PACKET
+
+    def record(self, time, sending_entity, event_entity, message, packet):
+        message_id = self.messages.get(message)
+        if message_id is None:
+            message_id = self.messages[message] = len(self.messages)
+
+        if not packet:
+            offset = NO_PACKET
+        elif packet is self.last_packet:
+            offset = self.last_packet_offset
+        else:
+            offset = self.packets_size
+            self.packets.write(PACKET_LENGTH.pack(len(packet)))
+            self.packets.write(packet)
+            self.packets_size += PACKET_LENGTH.size + len(packet)
+            self.last_packet = packet
+            self.last_packet_offset = offset
+
+        self.records.write(
+            RECORD.pack(time, sending_entity, event_entity, message_id, offset)
+        )
+
+    def close(self):
+        self.records.close()
+        self.packets.close()
+        with open(f"{self.name}.trace.msg", "w") as fp:
+            json.dump(list(self.messages), fp)
+
+
+def read_trace(name):
+    """Yields (time, sending_entity, event_entity, message, packet) for every record of a trace"""
+    with open(f"{name}.trace.msg", "r") as fp:
+        messages = json.load(fp)
+    with open(f"{name}.trace.pkt", "rb") as fp:
+        packets = fp.read()
+
+    with open(f"{name}.trace", "rb") as fp:
+        data = fp.read()
+
+    for time, sending_entity, event_entity, message_id, offset in RECORD.iter_unpack(data):
+        if offset == NO_PACKET:
+            packet = None
+        else:
+            (length,) = PACKET_LENGTH.unpack_from(packets, offset)
+            start = offset + PACKET_LENGTH.size
+            packet = packets[start : start + length]
+        yield time, sending_entity, event_entity, messages[message_id], packet
+
+
+def decode_trace(name, RDTHost):
+    """Writes the text logs (X--ASending.log and X--BSending.log) that the simulator would have written for trace X
+
+    Args:
+        name (string): the name of the trace (the simulator's test_name)
+        RDTHost (class): the host implementation that was simulated; its unpack_pkt is used to format packets
+    Returns:
+        nothing
+    """
+    from network_simulator import EventEntity, format_log_message
+
+    hosts = {entity: RDTHost(None, entity, 1, 1) for entity in EventEntity}
+    logs = {
+        EventEntity.A: open(f"{name}--ASending.log", "w"),
+        EventEntity.B: open(f"{name}--BSending.log", "w"),
+    }
+    try:
+        for time, sending_entity, event_entity, message, packet in read_trace(name):
+            event_entity = EventEntity(event_entity)
+            msg = format_log_message(
+                event_entity, time, message, packet, hosts[event_entity]
+            )
+            logs[EventEntity(sending_entity)].write(msg + "\n")
+    finally:
+        for log in logs.values():
+            log.close()
+
+
+if __name__ == "__main__":
+    from rdt_tester import PROTOCOLS
+
+    op = OptionParser(usage="%prog <trace name> [options]", description="Decodes a binary trace into text logs")
+    op.add_option(
+        "--protocol",
+        type="choice",
+        choices=sorted(PROTOCOLS),
+        default="gbn",
+        help="The host implementation that was simulated [default: %default]",
+    )
+    options, args = op.parse_args()
+    if len(args) != 1:
+        op.error("expected the name of a trace")
+
+    decode_trace(args[0], PROTOCOLS[options.protocol])
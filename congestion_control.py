@@ -0,0 +1,75 @@
+"""Congestion control policies for the RDT hosts
+
+A policy decides how many packets a host may have in flight. The host asks it for the current send window before
+sending, and reports every event that should change the window: packets being acknowledged, timer expiries and fast
+retransmits. The send window never exceeds the host's configured window_size, which is the size of its buffers.
+
+A policy whose fast_retransmit attribute is set needs to hear about duplicate ACKs, so hosts using it fast retransmit
+whether or not they were asked to.
+"""
+
+
+class FixedWindow:
+    """Always allows a full window of packets in flight, whatever the channel does (the original behaviour)"""
+
+    fast_retransmit = False
+
+    def __init__(self, window_size):
+        self.window_size = window_size
+
+    def window(self):
+        return self.window_size
+
+    def on_ack(self, num_acked):
+        pass
+
+    def on_timeout(self):
+        pass
+
+    def on_fast_retransmit(self):
+        pass
+
+
+class RenoCongestionControl:
+    """Reno style slow start and additive increase / multiplicative decrease
+
+    The congestion window (cwnd) starts at one packet and grows by one packet per acknowledged packet (slow start)
+    until it reaches ssthresh, after which it grows by roughly one packet per window (congestion avoidance). A timeout
+    halves ssthresh and restarts slow start from one packet; a fast retransmit halves both ssthresh and cwnd.
+
+    Duplicate ACKs are how Reno detects a loss without waiting for the timer, so it turns on fast retransmit.
+    """
+
+    fast_retransmit = True
+
+    def __init__(self, window_size):
+        self.window_size = window_size
+        self.cwnd = 1.0
+        self.ssthresh = float(window_size)
+
+    def window(self):
+        return max(1, min(self.window_size, int(self.cwnd)))
+
+    def on_ack(self, num_acked):
+        for _ in range(num_acked):
+            if self.cwnd < self.ssthresh:
+                self.cwnd += 1
+            else:
+                self.cwnd += 1 / self.cwnd
+        # Growing past the host's buffers would only build up a backlog of increases
+        self.cwnd = min(self.cwnd, float(self.window_size))
+
+    def on_timeout(self):
+        self.ssthresh = max(self.cwnd / 2, 2.0)
+        self.cwnd = 1.0
+
+    def on_fast_retransmit(self):
+        self.ssthresh = max(self.cwnd / 2, 2.0)
+        self.cwnd = self.ssthresh
+
+
+# The congestion control policies that can be selected by name
+CONGESTION_CONTROL = {
+    "fixed": FixedWindow,
+    "reno": RenoCongestionControl,
+}
@@ -1,13 +1,52 @@
 # from network_simulator import NetworkSimulator, EventEntity
 # from enum import Enum
-from struct import error, pack, unpack
+from collections import deque
+from struct import error
+
+from congestion_control import CONGESTION_CONTROL
+from internet_checksum import internet_checksum
+from packet import DATA_HEADER_SIZE, PacketView, build_ack_pkt, build_data_pkt
 
 MAX_UNSIGNED_INT = 4294967295
 
+# Default number of payloads that may wait in the send queue before the host signals backpressure
+SEND_QUEUE_HIGH_WATER = 1024
+
+# Constants of the Jacobson/Karels retransmission timeout estimator (RFC 6298)
+RTO_ALPHA = 1 / 8
+RTO_BETA = 1 / 4
+RTO_K = 4
+RTO_MIN = 0.5
+# The backed off timeout never grows beyond this many timer intervals
+RTO_MAX_BACKOFF = 64
+
+# Number of duplicate ACKs after which the window is retransmitted without waiting for the timer
+DUP_ACK_THRESHOLD = 3
+
+# Delayed ACK defaults: ACK every DELAYED_ACK_COUNT in-order packets, or DELAYED_ACK_TIMEOUT after the first unACKed one
+DELAYED_ACK_COUNT = 2
+DELAYED_ACK_TIMEOUT = 0.5
+# Handle of the receiver's delayed ACK timer (the retransmission timer uses the default handle, None)
+DELAYED_ACK_TIMER = "delayed_ack"
+
 
 class GBNHost:
 
-    def __init__(self, simulator, entity, timer_interval, window_size):
+    def __init__(
+        self,
+        simulator,
+        entity,
+        timer_interval,
+        window_size,
+        send_queue_high_water=SEND_QUEUE_HIGH_WATER,
+        adaptive_rto=False,
+        fast_retransmit=False,
+        dup_ack_threshold=DUP_ACK_THRESHOLD,
+        delayed_ack=False,
+        ack_every=DELAYED_ACK_COUNT,
+        ack_delay=DELAYED_ACK_TIMEOUT,
+        congestion_control="fixed",
+    ):
         """Initializes important values for GBNHost objects
 
         In addition to storing the passed in values, the values indicated in the initialization transition for the
@@ -21,6 +60,21 @@ class GBNHost:
                 any of functions in the simulator (the available functions are specified above).
             timer_interval (float): the amount of time that should pass before a timer expires
             window_size (int): the size of the window being used by this GBNHost
+            send_queue_high_water (int): the number of payloads waiting to enter the window at which the host starts
+                signalling backpressure to the application layer (see receive_from_application_layer)
+            adaptive_rto (bool): whether timers are armed with a retransmission timeout estimated from measured round
+                trip times (see sample_rtt) instead of the fixed timer_interval
+            fast_retransmit (bool): whether the window is retransmitted as soon as dup_ack_threshold duplicate ACKs
+                have been received, instead of only when the timer expires. Always on with a congestion control
+                policy that reacts to duplicate ACKs, such as "reno".
+            dup_ack_threshold (int): the number of duplicate ACKs that triggers a fast retransmit
+            delayed_ack (bool): whether the receiver delays ACKs for in-order packets, sending one cumulative ACK for
+                every ack_every packets or once ack_delay time has passed, whichever comes first. Out-of-order and
+                corrupt packets are still answered immediately.
+            ack_every (int): the number of in-order packets acknowledged by each delayed ACK
+            ack_delay (float): the longest time an in-order packet waits for its ACK
+            congestion_control (string): the name of the policy in congestion_control.CONGESTION_CONTROL that limits
+                how much of the window may be in flight. "fixed" always allows the whole window.
         Returns:
             nothing
         """
@@ -37,11 +91,44 @@ class GBNHost:
         self.unacked_buffer = [
             None
         ] * window_size  # Creates a list of length self.window_size filled with None values
-        self.app_layer_buffer = []
+        self.app_layer_buffer = deque()
+        self.send_queue_high_water = send_queue_high_water
+        self.backpressure = False
+        self.backpressure_callback = None
+
+        # Round trip time estimation. send_times holds when each packet in the window was first sent, retransmitted
+        # marks packets that were sent more than once and so cannot be sampled (Karn's rule).
+        self.adaptive_rto = adaptive_rto
+        self.send_times = [None] * window_size
+        self.retransmitted = [False] * window_size
+        self.srtt = None
+        self.rttvar = None
+        self.rto = timer_interval
+
+        self.congestion_control = CONGESTION_CONTROL[congestion_control](window_size)
+
+        # Duplicate ACK counting. fast_retransmit_base is the window base of the last fast retransmit, so that the
+        # duplicate ACKs caused by the retransmitted window itself do not trigger another one.
+        self.fast_retransmit = fast_retransmit or self.congestion_control.fast_retransmit
+        self.dup_ack_threshold = dup_ack_threshold
+        self.dup_acks = 0
+        self.fast_retransmit_base = None
+        self.fast_retransmits = 0  # packets resent by fast retransmits
+        self.timeout_retransmits = 0  # packets resent because a timer expired
+
+        # The next packet left to resend by the last retransmit_window, because it was beyond the send window the
+        # congestion control policy allowed (None if there is none), and whether that retransmit followed a timeout
+        self.resend_next = None
+        self.resend_after_timeout = False
 
         # These variables are relevant to the GBN Receiver FSM
         self.expected_seq_num = 0
         self.last_ack_pkt = self.create_ack_pkt(MAX_UNSIGNED_INT)
+        self.delayed_ack = delayed_ack
+        self.ack_every = ack_every
+        self.ack_delay = ack_delay
+        self.pending_acks = 0  # in-order packets received since last_ack_pkt was sent
+        self.ack_timer_running = False
 
     def receive_from_application_layer(self, payload):
         """Implements the functionality required to send packets received from simulated applications via the network
@@ -55,13 +142,23 @@ class GBNHost:
         self.simulator.stop_timer() in this function. Make sure you pass self.entity as the first argument when
         calling any of these functions.
 
+        Payloads that do not fit in the window wait in a send queue. The payload is always accepted, but once the
+        queue reaches send_queue_high_water the host reports backpressure so that producers can throttle: this
+        function returns False, and the callback registered with set_backpressure_callback is called with True. The
+        callback is called with False once the queue drains below the high-water mark again.
+
         Args:
             payload (string): the payload provided by a simulated application that needs to be sent
         Returns:
-            nothing
+            bool: whether the application may keep sending without waiting for the send queue to drain
         """
         self.app_layer_buffer.append(payload)
         self.process_app_layer_buffer()
+        return not self.backpressure
+
+    def set_backpressure_callback(self, callback):
+        """Register a function that is called with True when backpressure starts and False when it ends"""
+        self.backpressure_callback = callback
 
     def receive_from_network_layer(self, packet):
         """Implements the functionality required to receive packets received from simulated applications via the
@@ -84,76 +181,108 @@ class GBNHost:
         Returns:
             nothing
         """
-        if not self.is_corrupt(packet):
-            packet_type, seq_num, _ = unpack("!HIH", packet[:8])
+        # Parse the header once and share the view with is_corrupt and unpack_pkt
+        view = self.parse_pkt(packet)
+        if view is not None and not self.is_corrupt(view):
+            packet_type, seq_num = view.packet_type, view.seq_num
 
             if packet_type == 0x1:  # ACK packet
                 # Check for valid ACK number, avoiding the initial default ACK number
                 if seq_num != MAX_UNSIGNED_INT and seq_num >= self.window_base:
+                    self.sample_rtt(seq_num)
+                    self.dup_acks = 0
                     # Move window base to the next expected sequence number
+                    self.congestion_control.on_ack(seq_num + 1 - self.window_base)
                     self.window_base = (seq_num + 1) % (MAX_UNSIGNED_INT + 1)
                     self.simulator.stop_timer(self.entity)
                     # Restart timer if there are still unacknowledged packets
                     if self.window_base != self.next_seq_num:
-                        self.simulator.start_timer(self.entity, self.timer_interval)
-                    # Send any buffered packets that now fall within the window
-                    while (
-                        len(self.app_layer_buffer) > 0
-                        and self.next_seq_num < self.window_base + self.window_size
-                    ):
-                        payload = self.app_layer_buffer.pop(0)
-                        pkt = self.create_data_pkt(self.next_seq_num, payload)
-                        self.unacked_buffer[self.next_seq_num % self.window_size] = pkt
-                        self.simulator.pass_to_network_layer(self.entity, pkt)
-                        if self.window_base == self.next_seq_num:
-                            self.simulator.start_timer(self.entity, self.timer_interval)
-                        self.next_seq_num += 1
+                        self.simulator.start_timer(self.entity, self.current_rto())
+                    # Resend what the last retransmit left out, then send any buffered packets, as far as the window
+                    # now allows
+                    if self.resend_after_timeout:
+                        self.timeout_retransmits += self.resend_pending()
+                    else:
+                        self.fast_retransmits += self.resend_pending()
+                    self.process_app_layer_buffer()
                 else:
                     print(
                         f"Received ACK {seq_num} is not valid for window base {self.window_base}. Ignoring."
                     )
+                    if self.fast_retransmit:
+                        self.count_duplicate_ack(seq_num)
             else:  # Data packet
                 if seq_num == self.expected_seq_num:
                     try:
                         # Extract and pass data to application layer
-                        data = self.unpack_pkt(packet)["payload"].decode()
+                        data = view.payload.decode()
                         self.simulator.pass_to_application_layer(self.entity, data)
-                        # Send ACK for the received packet
+                        # Send (or, with delayed ACKs, schedule) the ACK for the received packet. Every in-order
+                        # packet has a new sequence number, so its ACK is always built afresh; duplicate and corrupt
+                        # arrivals resend last_ack_pkt.
                         self.last_ack_pkt = self.create_ack_pkt(self.expected_seq_num)
-                        self.simulator.pass_to_network_layer(
-                            self.entity, self.last_ack_pkt
-                        )
                         self.expected_seq_num = (self.expected_seq_num + 1) % (
                             MAX_UNSIGNED_INT + 1
                         )
+                        if self.delayed_ack:
+                            self.delay_ack()
+                        else:
+                            self.send_ack()
                     except Exception:
                         # In case of payload extraction issues, resend the last ACK
-                        self.simulator.pass_to_network_layer(
-                            self.entity, self.last_ack_pkt
-                        )
+                        self.send_ack()
                 else:
                     # Resend the last ACK if the sequence number is unexpected
-                    self.simulator.pass_to_network_layer(self.entity, self.last_ack_pkt)
+                    self.send_ack()
         else:
             # Resend the last ACK if the packet is corrupt or the sequence number is unexpected
-            self.simulator.pass_to_network_layer(self.entity, self.last_ack_pkt)
+            self.send_ack()
+
+    def send_ack(self):
+        """Sends last_ack_pkt right away, which also covers any in-order packets whose ACK was being delayed"""
+        if self.ack_timer_running:
+            self.ack_timer_running = False
+            self.simulator.stop_timer(self.entity, DELAYED_ACK_TIMER)
+        self.pending_acks = 0
+        self.simulator.pass_to_network_layer(self.entity, self.last_ack_pkt)
+
+    def delay_ack(self):
+        """Holds back the ACK for an in-order packet until ack_every packets are waiting or the ACK timer expires"""
+        self.pending_acks += 1
+        if self.pending_acks >= self.ack_every:
+            self.send_ack()
+        elif not self.ack_timer_running:
+            self.ack_timer_running = True
+            self.simulator.start_timer(self.entity, self.ack_delay, DELAYED_ACK_TIMER)
 
     def process_app_layer_buffer(self):
-        """Processes buffered application layer data if the window has space."""
+        """Processes buffered application layer data if the window has space, then updates the backpressure state."""
         while (
             len(self.app_layer_buffer) > 0
-            and self.next_seq_num < self.window_base + self.window_size
+            and self.next_seq_num < self.window_base + self.send_window()
         ):
-            pkt_payload = self.app_layer_buffer.pop(0)
+            pkt_payload = self.app_layer_buffer.popleft()
             pkt = self.create_data_pkt(self.next_seq_num, pkt_payload)
             self.unacked_buffer[self.next_seq_num % self.window_size] = pkt
+            self.send_times[self.next_seq_num % self.window_size] = self.simulator.time
+            self.retransmitted[self.next_seq_num % self.window_size] = False
 
             self.simulator.pass_to_network_layer(self.entity, pkt)
             if self.window_base == self.next_seq_num:
-                self.simulator.start_timer(self.entity, self.timer_interval)
+                self.simulator.start_timer(self.entity, self.current_rto())
             self.next_seq_num += 1
 
-    def timer_interrupt(self):
+        self.update_backpressure()
+
+    def update_backpressure(self):
+        """Signals backpressure to the application layer when the send queue crosses its high-water mark"""
+        backpressure = len(self.app_layer_buffer) >= self.send_queue_high_water
+        if backpressure != self.backpressure:
+            self.backpressure = backpressure
+            if self.backpressure_callback is not None:
+                self.backpressure_callback(backpressure)
+
+    def timer_interrupt(self, handle=None):
         """Implements the functionality that handles when a timeout occurs for the oldest unacknowledged packet
 
         This function will be called by the NetworkSimulator when a timeout occurs for the oldest unacknowledged packet
@@ -163,21 +292,133 @@ class GBNHost:
         You'll need to call self.simulator.start_timer() in this function. Make sure you pass self.entity as the first
         argument when calling this functions.
 
+        The receiver's delayed ACK timer (handle DELAYED_ACK_TIMER) also ends up here; it sends the delayed ACK.
+
         Args:
-            None
+            handle: None for the retransmission timer, or DELAYED_ACK_TIMER
         Returns:
             None
         """
+        if handle == DELAYED_ACK_TIMER:
+            self.ack_timer_running = False
+            self.send_ack()
+            return
+
         # Restart the timer for the next transmission attempt.
-        self.simulator.start_timer(self.entity, self.timer_interval)
+        self.back_off_rto()
+        self.simulator.start_timer(self.entity, self.current_rto())
+
+        self.congestion_control.on_timeout()
+        self.resend_after_timeout = True
+        self.timeout_retransmits += self.retransmit_window()
 
-        # Retransmit all packets in the window that have not been acknowledged.
-        for i in range(self.window_base, self.next_seq_num):
+    def send_window(self):
+        """The number of packets that may currently be in flight, as allowed by the congestion control policy"""
+        return self.congestion_control.window()
+
+    def retransmit_window(self):
+        """Retransmits the packets in the window that have not been acknowledged, as far as the send window allows
+
+        Called after the congestion control policy has reacted to the loss, so a cut in the window applies to the
+        retransmission itself. The packets beyond the send window are resent by resend_pending as ACKs open it again.
+
+        Returns:
+            int: the number of packets retransmitted
+        """
+        self.resend_next = self.window_base
+        return self.resend_pending()
+
+    def resend_pending(self):
+        """Resends the packets left out by the last retransmit_window that now fit in the send window
+
+        Returns:
+            int: the number of packets resent
+        """
+        if self.resend_next is None:
+            return 0
+
+        start = max(self.resend_next, self.window_base)
+        end = min(self.next_seq_num, self.window_base + self.send_window())
+        self.resend_next = max(start, end) if end < self.next_seq_num else None
+
+        count = 0
+        for i in range(start, end):
             if self.unacked_buffer[i % self.window_size] is not None:
+                self.retransmitted[i % self.window_size] = True
                 print(f"Resending packet {i % self.window_size}")
                 self.simulator.pass_to_network_layer(
                     self.entity, self.unacked_buffer[i % self.window_size]
                 )
+                count += 1
+        return count
+
+    def count_duplicate_ack(self, seq_num):
+        """Counts an ACK for the packet just below the window base, fast retransmitting the window at the threshold
+
+        At most one fast retransmit is made per window base; if that does not recover the loss, the timer will.
+
+        Args:
+            seq_num (int): the sequence number of the ACK
+        Returns:
+            nothing
+        """
+        if (
+            seq_num != (self.window_base - 1) % (MAX_UNSIGNED_INT + 1)
+            or self.window_base == self.next_seq_num
+        ):
+            return
+
+        self.dup_acks += 1
+        if (
+            self.dup_acks >= self.dup_ack_threshold
+            and self.fast_retransmit_base != self.window_base
+        ):
+            self.fast_retransmit_base = self.window_base
+            self.simulator.stop_timer(self.entity)
+            self.simulator.start_timer(self.entity, self.current_rto())
+            self.congestion_control.on_fast_retransmit()
+            self.resend_after_timeout = False
+            self.fast_retransmits += self.retransmit_window()
+
+    def current_rto(self):
+        """The interval timers should be armed with: the estimated RTO if adaptive_rto is set, else timer_interval"""
+        if self.adaptive_rto:
+            return self.rto
+        return self.timer_interval
+
+    def sample_rtt(self, seq_num):
+        """Updates the round trip time estimate when an ACK acknowledges new data
+
+        Following Karn's rule, retransmitted packets are not sampled since it is unknown which transmission the ACK
+        belongs to. Samples update SRTT and RTTVAR as in RFC 6298. Since the ACK shows the path is delivering again,
+        the backoff from earlier timeouts is dropped whether or not a sample could be taken (as Linux does);
+        otherwise a lossy go-back-N window, in which every packet ends up retransmitted, never yields a sample and
+        stays backed off.
+
+        Args:
+            seq_num (int): the sequence number of the acknowledged packet
+        Returns:
+            nothing
+        """
+        slot = seq_num % self.window_size
+        if not self.retransmitted[slot] and self.send_times[slot] is not None:
+            rtt = self.simulator.time - self.send_times[slot]
+            if self.srtt is None:
+                self.srtt = rtt
+                self.rttvar = rtt / 2
+            else:
+                self.rttvar = (1 - RTO_BETA) * self.rttvar + RTO_BETA * abs(self.srtt - rtt)
+                self.srtt = (1 - RTO_ALPHA) * self.srtt + RTO_ALPHA * rtt
+
+        if self.srtt is None:
+            self.rto = self.timer_interval
+        else:
+            self.rto = max(RTO_MIN, self.srtt + RTO_K * self.rttvar)
+
+    def back_off_rto(self):
+        """Doubles the RTO after a timeout, up to RTO_MAX_BACKOFF timer intervals"""
+        if self.adaptive_rto:
+            self.rto = min(self.rto * 2, self.timer_interval * RTO_MAX_BACKOFF)
 
     def create_data_pkt(self, seq_num, payload):
         """Create a data packet with a given sequence number and variable length payload
@@ -199,27 +440,8 @@ class GBNHost:
         Returns:
             bytes: a bytes object containing the required fields for a data packet
         """
-        packet_type = 0x0
-        payload_length = len(payload)
-        checksum = 0
-        # Packet format before checksum: packet_type, seq_num, checksum (placeholder), payload_length, payload
-        pkt_without_checksum = pack(
-            "!HIHI{}s".format(payload_length),
-            packet_type,
-            seq_num,
-            checksum,
-            payload_length,
-            payload.encode(),
-        )
-        checksum = self.create_checksum(pkt_without_checksum)
-        return pack(
-            "!HIHI{}s".format(payload_length),
-            packet_type,
-            seq_num,
-            checksum,
-            payload_length,
-            payload.encode(),
-        )
+        # The checksum is computed from the field values, so the packet is only packed once (see packet.py)
+        return build_data_pkt(seq_num, payload.encode())
 
     def create_ack_pkt(self, seq_num):
         """Create an acknowledgment packet with a given sequence number
@@ -239,12 +461,7 @@ class GBNHost:
         Returns:
             bytes: a bytes object containing the required fields for a data packet
         """
-        packet_type = 0x1
-        checksum = 0
-        # Packet format before checksum: packet_type, seq_num, checksum (placeholder)
-        pkt_without_checksum = pack("!HIH", packet_type, seq_num, checksum)
-        checksum = self.create_checksum(pkt_without_checksum)
-        return pack("!HIH", packet_type, seq_num, checksum)
+        return build_ack_pkt(seq_num)
 
     # This function should accept a bytes object and return a checksum for the bytes object.
     def create_checksum(self, packet):
@@ -260,22 +477,15 @@ class GBNHost:
         Returns:
             int: the checksum value
         """
-        # Summation of all 16-bit words in the packet
-        sum = 0
-        for i in range(0, len(packet), 2):
-            if i + 1 < len(packet):
-                word = (packet[i] << 8) + packet[i + 1]
-            else:
-                word = packet[i] << 8
-            sum = sum + word
+        # Folds all 16-bit words of the packet at once, see internet_checksum.py
+        return internet_checksum(packet)
 
-        # Add carry to the sum if any
-        while (sum >> 16) > 0:
-            sum = (sum & 0xFFFF) + (sum >> 16)
-
-        # One's complement of the sum
-        checksum = ~sum & 0xFFFF
-        return checksum
+    def parse_pkt(self, packet):
+        """Create a PacketView over a received packet, or return None if it is too short to hold a packet header"""
+        try:
+            return PacketView(packet)
+        except error:
+            return None
 
     def unpack_pkt(self, packet):
         """Create a dictionary containing the contents of a given packet
@@ -302,44 +512,34 @@ class GBNHost:
             dictionary: a dictionary containing the different values stored in the packet
         """
         try:
-            # Check minimum length for type and sequence number and checksum
-            if len(packet) < 6:
-                print("Packet is too short for type, sequence number, and checksum")
-                return None  # Not enough data for any packet
-
-            # Unpack common header parts
-            packet_type, seq_num, checksum = unpack("!HIH", packet[:8])
+            if isinstance(packet, PacketView):
+                view = packet
+            else:
+                # Check minimum length for type and sequence number and checksum
+                if len(packet) < 6:
+                    print("Packet is too short for type, sequence number, and checksum")
+                    return None  # Not enough data for any packet
 
-            unpacked_data = {
-                "packet_type": packet_type,
-                "seq_num": seq_num,
-                "checksum": checksum,
-            }
+                view = PacketView(packet)
 
-            # For ACK packets, this is all we need
-            if packet_type == 0x1:
-                return unpacked_data
+            # For ACK packets, the header is all we need
+            if view.packet_type == 0x1:
+                return view.as_dict()
 
             # Ensure there's enough remaining packet for payload_length
-            if len(packet) < 12:
+            if len(view.buffer) < DATA_HEADER_SIZE:
                 print("Packet is too short for payload length")
                 return None  # Not enough data for a data packet
 
-            # Extract payload_length for data packets
-            (payload_length,) = unpack("!I", packet[8:12])
-            if len(packet) < 12 + payload_length:
+            if len(view.buffer) < DATA_HEADER_SIZE + view.payload_length:
                 print("Packet is too short for its claimed payload length")
-                print(f"Packet length: {len(packet)}, payload length: {payload_length}")
+                print(
+                    f"Packet length: {len(view.buffer)}, payload length: {view.payload_length}"
+                )
                 # Packet is too short for its claimed payload length
                 return None
 
-            # Extract the payload, if any
-            payload_format = f"!{payload_length}s"
-            (payload,) = unpack(payload_format, packet[12 : 12 + payload_length])
-            unpacked_data["payload_length"] = payload_length
-            unpacked_data["payload"] = payload
-
-            return unpacked_data
+            return view.as_dict()
         except error as e:
             # Log or handle the specific struct.error if needed
             print(f"Error unpacking packet: {e}")
@@ -351,49 +551,18 @@ class GBNHost:
         This function should use the included Internet checksum to determine whether this packet has been corrupted.
         It also handles cases where the payload length might be corrupted, leading to exceptions when unpacking.
 
+        The checksum is verified directly over the received buffer (see PacketView.is_corrupt), so the packet is not
+        copied or repacked. A PacketView that was already created for this packet may be passed instead of the bytes.
+
         Args:
             packet (bytes): a bytes object containing a packet's data
         Returns:
             bool: whether or not the packet data has been corrupted
         """
         try:
-            # Attempt to unpack the packet type, sequence number, and checksum
-            packet_type, seq_num, original_checksum = unpack("!HIH", packet[:8])
-
-            # If the packet is an ACK, it has no payload length or payload, so only the checksum is checked
-            if packet_type == 0x1:
-                packet_without_checksum = pack(
-                    "!HIH",
-                    packet_type,
-                    seq_num,
-                    0,
-                )
-                recalculated_checksum = self.create_checksum(packet_without_checksum)
-
-                is_corrupt = recalculated_checksum != original_checksum
-
-            else:
-                # Attempt to unpack the payload length, if it fails, the packet is corrupt
-                payload_length = unpack("!I", packet[8:12])[0]
-                payload = packet[
-                    12 : 12 + payload_length
-                ]  # This might raise an exception if payload_length is corrupted
-
-                # Reconstruct packet without checksum for validation
-                packet_without_checksum = pack(
-                    "!HIHI{}s".format(len(payload)),
-                    packet_type,
-                    seq_num,
-                    0,
-                    payload_length,
-                    payload,
-                )
-
-                # Recalculate checksum
-                recalculated_checksum = self.create_checksum(packet_without_checksum)
-
-                # Compare recalculated checksum with the original
-                is_corrupt = recalculated_checksum != original_checksum
+            if not isinstance(packet, PacketView):
+                packet = PacketView(packet)
+            is_corrupt = packet.is_corrupt()
 
         except error as e:
             # If an exception is caught, it's likely due to a corrupted packet length
@@ -0,0 +1,80 @@
+"""Internet checksum (RFC 1071) helpers used by the RDT hosts.
+
+The one's complement sum of a buffer's 16-bit big-endian words is congruent to the buffer's value as one big-endian
+integer modulo 0xFFFF, because 2**16 is congruent to 1 modulo 0xFFFF. This lets the whole buffer be folded with a
+single int.from_bytes call and one modulo operation instead of a Python-level loop over every word. The end-around
+carry fold of a non-zero sum never produces 0, so a remainder of 0 maps to 0xFFFF unless every word was zero.
+"""
+
+ONES_COMPLEMENT_MODULUS = 0xFFFF
+
+
+def ones_complement_sum(data):
+    """Return the 16-bit one's complement sum of the big-endian words in data
+
+    An odd length buffer is treated as if it were padded with a single zero byte.
+
+    Args:
+        data (bytes-like): the buffer to sum
+    Returns:
+        int: the folded sum, between 0 and 0xFFFF
+    """
+    value = int.from_bytes(data, "big")
+    if len(data) % 2:
+        value <<= 8
+    if value == 0:
+        return 0
+    return value % ONES_COMPLEMENT_MODULUS or ONES_COMPLEMENT_MODULUS
+
+
+def internet_checksum(data):
+    """Return the Internet checksum (the complement of the one's complement sum) of data
+
+    Args:
+        data (bytes-like): the buffer the checksum will be based on
+    Returns:
+        int: the checksum value, between 0 and 0xFFFF
+    """
+    return ~ones_complement_sum(data) & 0xFFFF
+
+
+def update_checksum(checksum, old_value, new_value):
+    """Incrementally update a checksum after one field of the checksummed buffer changed (RFC 1624, eqn. 3)
+
+    The field must start on a 16-bit boundary of the buffer and be a whole number of 16-bit words long (e.g. the
+    4 byte seq_num field of a packet). Its old and new contents are given as unsigned integers. The cost is
+    independent of the size of the buffer.
+
+    The result matches recomputing the checksum over the updated buffer, as long as that buffer is not all zeros.
+
+    Args:
+        checksum (int): the checksum of the buffer before the change
+        old_value (int): the previous value of the field
+        new_value (int): the new value of the field
+    Returns:
+        int: the checksum of the buffer after the change
+    """
+    total = ((~checksum & 0xFFFF) - old_value + new_value) % ONES_COMPLEMENT_MODULUS
+    return ~(total or ONES_COMPLEMENT_MODULUS) & 0xFFFF
+
+
+def internet_checksum_excluding(data, offset):
+    """Return the Internet checksum of data as if the 16-bit word at offset were zero
+
+    This is used to verify a received packet directly from its buffer, without first copying the packet to clear its
+    checksum field.
+
+    Args:
+        data (bytes-like): the buffer the checksum will be based on
+        offset (int): the (even) byte offset of the 16-bit word to ignore
+    Returns:
+        int: the checksum value, between 0 and 0xFFFF
+    """
+    value = int.from_bytes(data, "big")
+    shift = 8 * (len(data) - offset - 2)
+    value -= int.from_bytes(data[offset : offset + 2], "big") << shift
+    if len(data) % 2:
+        value <<= 8
+    if value == 0:
+        return 0xFFFF
+    return ~(value % ONES_COMPLEMENT_MODULUS or ONES_COMPLEMENT_MODULUS) & 0xFFFF
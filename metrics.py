@@ -0,0 +1,272 @@
+"""Delivery metrics of a simulation run: latency, goodput, retransmissions and window occupancy
+
+SimulationMetrics attaches to a NetworkSimulator before it runs and measures:
+    - the one-way delivery latency of every message, from the moment the simulator hands it to the sending host's
+      receive_from_application_layer until the receiving host passes it to pass_to_application_layer, recorded in a
+      LatencyHistogram
+    - goodput, the number of messages (and payload characters) delivered per unit of simulated time
+    - the retransmission ratio, the number of data packets sent beyond one per message, per message
+    - the window occupancy of each host (next_seq_num - window_base), as its time-weighted mean and as a series
+      sampled at a fixed interval of simulated time
+
+Memory use is bounded: the histogram has a fixed number of buckets, the occupancy series is thinned out (every other
+sample dropped and the interval doubled) whenever it reaches max_samples, and only messages that are still in flight
+are remembered.
+
+Like profiling.SimulationProfiler, the metrics are collected by wrapping methods of the simulator and host instances,
+so a simulator without metrics attached runs exactly as before.
+"""
+
+import csv
+import json
+from collections import deque
+
+from network_simulator import EventEntity
+
+
+class LatencyHistogram:
+    """A histogram with a bounded relative error per bucket, in the style of HdrHistogram
+
+    Values are counted in units of resolution. Values below 2 ** sub_bucket_bits units get a bucket each; above that,
+    every power of two range is split into 2 ** (sub_bucket_bits - 1) equal buckets, so a bucket is never wider than
+    2 ** -(sub_bucket_bits - 1) of the values in it. Only buckets that have been used are stored.
+    """
+
+    def __init__(self, resolution=0.001, sub_bucket_bits=7):
+        self.resolution = resolution
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def bucket_index(self, units):
+        if units < 1 << self.sub_bucket_bits:
+            return units
+        shift = units.bit_length() - self.sub_bucket_bits
+        return (shift << self.sub_bucket_bits) + (units >> shift)
+
+    def bucket_bounds(self, index):
+        """The range of values [low, high) counted in a bucket"""
+        if index < 1 << self.sub_bucket_bits:
+            low, high = index, index + 1
+        else:
+            shift = index >> self.sub_bucket_bits
+            mantissa = index & ((1 << self.sub_bucket_bits) - 1)
+            low, high = mantissa << shift, (mantissa + 1) << shift
+        return low * self.resolution, high * self.resolution
+
+    def record(self, value):
+        index = self.bucket_index(int(value / self.resolution))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percentile):
+        """The value below which the given percentage of the recorded values fall, to within a bucket
+
+        Reports the upper bound of the bucket holding that value, but never more than the largest recorded value.
+        """
+        if not self.count:
+            return None
+
+        target = max(1, percentile / 100 * self.count)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self.bucket_bounds(index)[1], self.max)
+        return self.max
+
+    def buckets(self):
+        """The used buckets as (low, high, count), in increasing order"""
+        return [(*self.bucket_bounds(index), self.counts[index]) for index in sorted(self.counts)]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "min": self.min,
+            "mean": self.mean(),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+            "max": self.max,
+        }
+
+
+class SimulationMetrics:
+    """Collects the metrics of one simulation run
+
+    Args:
+        simulator (NetworkSimulator): the simulator to measure, before it has run
+        sample_interval (float): the simulated time between two samples of the window occupancy series
+        max_samples (int): the most samples kept per host before the series is thinned out
+        resolution (float): the resolution of the latency histogram, in units of simulated time
+    """
+
+    def __init__(self, simulator, sample_interval=1.0, max_samples=1024, resolution=0.001):
+        self.simulator = simulator
+        self.latency = LatencyHistogram(resolution)
+
+        # Send time and payload of the messages still in flight from each entity. Messages are delivered in order,
+        # so the oldest one is always the next to arrive.
+        self.in_flight = {EventEntity.A: deque(), EventEntity.B: deque()}
+        self.delivered = 0
+        self.delivered_chars = 0
+        self.out_of_order = 0
+
+        self.max_samples = max_samples
+        self.sample_interval = {EventEntity.A: sample_interval, EventEntity.B: sample_interval}
+        self.occupancy_series = {EventEntity.A: [], EventEntity.B: []}
+        self.next_sample = {EventEntity.A: 0.0, EventEntity.B: 0.0}
+        self.occupancy = {EventEntity.A: 0, EventEntity.B: 0}
+        self.occupancy_since = {EventEntity.A: 0.0, EventEntity.B: 0.0}
+        self.occupancy_area = {EventEntity.A: 0.0, EventEntity.B: 0.0}
+        self.max_occupancy = {EventEntity.A: 0, EventEntity.B: 0}
+
+        for host in (simulator.A, simulator.B):
+            host.receive_from_application_layer = self.wrap_app_layer_arrival(
+                host, host.receive_from_application_layer
+            )
+            host.receive_from_network_layer = self.wrap_host_callback(host, host.receive_from_network_layer)
+            host.timer_interrupt = self.wrap_host_callback(host, host.timer_interrupt)
+        simulator.pass_to_application_layer = self.wrap_delivery(simulator.pass_to_application_layer)
+
+    def wrap_app_layer_arrival(self, host, callback):
+        def measured(payload):
+            self.in_flight[host.entity].append((self.simulator.time, payload))
+            result = callback(payload)
+            self.observe_window(host)
+            return result
+
+        return measured
+
+    def wrap_host_callback(self, host, callback):
+        def measured(*args):
+            result = callback(*args)
+            self.observe_window(host)
+            return result
+
+        return measured
+
+    def wrap_delivery(self, deliver):
+        def measured(entity, data):
+            deliver(entity, data)
+
+            sent = self.in_flight[self.simulator.opposite_entity(entity)]
+            if sent and sent[0][1] == data:
+                send_time, _ = sent.popleft()
+                self.latency.record(self.simulator.time - send_time)
+                self.delivered += 1
+                self.delivered_chars += len(data)
+            else:
+                # Not the message we expected next, so its latency is unknown
+                self.out_of_order += 1
+
+        return measured
+
+    def observe_window(self, host):
+        entity = host.entity
+        now = self.simulator.time
+        occupancy = getattr(host, "next_seq_num", 0) - getattr(host, "window_base", 0)
+
+        # The occupancy is a step function of time, changing only in host callbacks
+        previous = self.occupancy[entity]
+        if now > self.occupancy_since[entity]:
+            self.occupancy_area[entity] += previous * (now - self.occupancy_since[entity])
+            self.occupancy_since[entity] = now
+
+        series = self.occupancy_series[entity]
+        while self.next_sample[entity] <= now:
+            series.append((self.next_sample[entity], previous))
+            self.next_sample[entity] += self.sample_interval[entity]
+            if len(series) >= self.max_samples:
+                del series[1::2]
+                self.sample_interval[entity] *= 2
+                self.next_sample[entity] = series[-1][0] + self.sample_interval[entity]
+
+        self.occupancy[entity] = occupancy
+        if occupancy > self.max_occupancy[entity]:
+            self.max_occupancy[entity] = occupancy
+
+    def summary(self):
+        simulator = self.simulator
+        sim_time = simulator.time
+        data_sent = simulator.A.num_data_sent + simulator.B.num_data_sent
+
+        window = {}
+        for entity in EventEntity:
+            # The last occupancy lasts until the end of the run
+            area = self.occupancy_area[entity]
+            if sim_time > self.occupancy_since[entity]:
+                area += self.occupancy[entity] * (sim_time - self.occupancy_since[entity])
+            window[entity.name] = {
+                "mean": area / sim_time if sim_time else 0.0,
+                "max": self.max_occupancy[entity],
+            }
+
+        return {
+            "sim_time": sim_time,
+            "messages": simulator.nsim,
+            "delivered": self.delivered,
+            "undelivered": sum(len(sent) for sent in self.in_flight.values()),
+            "out_of_order": self.out_of_order,
+            "goodput": self.delivered / sim_time if sim_time else 0.0,
+            "goodput_chars": self.delivered_chars / sim_time if sim_time else 0.0,
+            "retransmission_ratio": (data_sent - simulator.nsim) / simulator.nsim if simulator.nsim else 0.0,
+            "latency": self.latency.summary(),
+            "window_occupancy": window,
+        }
+
+    def to_dict(self):
+        result = self.summary()
+        result["latency_histogram"] = [
+            {"low": low, "high": high, "count": count} for low, high, count in self.latency.buckets()
+        ]
+        result["window_occupancy_series"] = {
+            entity.name: [{"time": t, "occupancy": occupancy} for t, occupancy in self.occupancy_series[entity]]
+            for entity in EventEntity
+        }
+        return result
+
+    def export_json(self, path):
+        with open(path, "w") as fp:
+            json.dump(self.to_dict(), fp, indent=4)
+
+    def export_csv(self, prefix):
+        """Writes <prefix>_summary.csv, <prefix>_latency.csv (the histogram) and <prefix>_window.csv (the series)"""
+        with open(f"{prefix}_summary.csv", "w", newline="") as fp:
+            writer = csv.writer(fp)
+            writer.writerow(["metric", "value"])
+            for name, value in flatten(self.summary()):
+                writer.writerow([name, value])
+
+        with open(f"{prefix}_latency.csv", "w", newline="") as fp:
+            writer = csv.writer(fp)
+            writer.writerow(["low", "high", "count"])
+            writer.writerows(self.latency.buckets())
+
+        with open(f"{prefix}_window.csv", "w", newline="") as fp:
+            writer = csv.writer(fp)
+            writer.writerow(["entity", "time", "occupancy"])
+            for entity in EventEntity:
+                for t, occupancy in self.occupancy_series[entity]:
+                    writer.writerow([entity.name, t, occupancy])
+
+
+def flatten(summary, prefix=""):
+    """Yields (dotted name, value) for every value in a nested summary dictionary"""
+    for name, value in summary.items():
+        if isinstance(value, dict):
+            yield from flatten(value, f"{prefix}{name}.")
+        else:
+            yield f"{prefix}{name}", value
@@ -1,8 +1,28 @@
-import copy
+import heapq
+import itertools
 import json
 import random
 import struct
-from enum import Enum, IntEnum
+from enum import IntEnum
+
+from binary_trace import BinaryTraceWriter
+
+# Window size used by both hosts when the options do not specify one
+DEFAULT_WINDOW_SIZE = 5
+
+# The first field of every packet; read in place so that checking a packet's type does not copy it
+PACKET_TYPE = struct.Struct("!H")
+
+# Options that are passed on to both hosts as keyword arguments, but only when they have been set
+HOST_OPTIONS = [
+    "adaptive_rto",
+    "fast_retransmit",
+    "dup_ack_threshold",
+    "delayed_ack",
+    "ack_every",
+    "ack_delay",
+    "congestion_control",
+]
 
 
 class NetworkSimulator:
@@ -12,11 +32,22 @@ class NetworkSimulator:
     # *********** ROUTINES FOR STUDENT USE CAN BE FOUND BELOW **********
     def __init__(self, test_name, options, RDTHost):
         self.continue_simulation = True
-        self.event_list = []
+        self.event_list = EventQueue()
+
+        # Latest scheduled arrival time and number of in-flight packets for the channel towards each entity. Packets
+        # on a channel are consumed in arrival order, so the tail only needs resetting once the channel drains.
+        self.channel_tail = {EventEntity.A: None, EventEntity.B: None}
+        self.channel_in_flight = {EventEntity.A: 0, EventEntity.B: 0}
+
+        # Armed timers keyed by (entity, handle), and the handle of every timer event still sitting in the event
+        # list. Stopping a timer only forgets it here; its event is discarded when it reaches the front of the list.
+        self.timers = {}
+        self.timer_handles = {}
 
         # Configuration for the packet simulation
         self.max_events = options.num_pkts  # number of msgs to generate, then stop
         self.timer_interval = options.timer_interval
+        self.window_size = getattr(options, "window_size", None) or DEFAULT_WINDOW_SIZE
         self.lossprob = options.loss_prob  # probability that a packet is dropped
         self.corruptprob = (
             options.corrupt_prob
@@ -33,12 +64,27 @@ class NetworkSimulator:
         self.nlost = 0  # number lost in media
         self.ncorrupt = 0  # number corrupted by media
 
-        # If we specify a seed, initialize random with it
-        if options.seed:
-            random.seed(options.seed)
+        # Every simulator draws from its own generator, so several simulators can run in one process without
+        # disturbing each other. Seeding a Random instance gives exactly the sequence that seeding the global random
+        # module did, so seeded runs are unchanged. With global_random set the simulator seeds (if a seed is given)
+        # and draws from the global random module, as it always used to.
+        if getattr(options, "global_random", False):
+            self.random = random
+            if options.seed:
+                random.seed(options.seed)
+        else:
+            self.random = random.Random(options.seed or None)
+
+        host_options = {
+            name: getattr(options, name)
+            for name in HOST_OPTIONS
+            if getattr(options, name, None) is not None
+        }
 
         # Create the two hosts we will be simulating
-        self.A = RDTHost(self, EventEntity.A, self.timer_interval, 5)
+        self.A = RDTHost(
+            self, EventEntity.A, self.timer_interval, self.window_size, **host_options
+        )
         # These variables will be used by the testing suite
         self.A.num_data_sent = 0
         self.A.num_ack_sent = 0
@@ -47,7 +93,9 @@ class NetworkSimulator:
         self.A.data_sent = []
         self.A.data_received = []
 
-        self.B = RDTHost(self, EventEntity.B, self.timer_interval, 5)
+        self.B = RDTHost(
+            self, EventEntity.B, self.timer_interval, self.window_size, **host_options
+        )
         self.B.num_data_sent = 0
         self.B.num_ack_sent = 0
         self.B.num_data_received = 0
@@ -61,16 +109,73 @@ class NetworkSimulator:
         }
 
         self.test_name = test_name
-        self.A_as_sender_log = open(f"{test_name}--ASending.log", "w")
-        self.B_as_sender_log = open(f"{test_name}--BSending.log", "w")
+        self.event_log = getattr(options, "event_log", None) or "json"
+        self.events = None
+        if getattr(options, "trace_format", None) == "binary":
+            self.trace = BinaryTraceWriter(test_name)
+        else:
+            self.trace = None
+            self.A_as_sender_log = open(f"{test_name}--ASending.log", "w")
+            self.B_as_sender_log = open(f"{test_name}--BSending.log", "w")
 
         # Generate the first event
         self.generate_next_arrival()
 
     def Simulate(self):
+        """Runs the simulation to completion, writing the processed events as selected by the event_log option
+
+        Returns:
+            list: every processed event when the events are written to _events.json (the default), which needs all of
+                them at once; None when they are streamed to _events.jsonl or not written at all
+        """
+        for _ in self.simulation():
+            pass
+        return self.events
+
+    def simulation(self):
+        """Runs the simulation exactly like Simulate, but as a generator that yields after every processed event
+
+        This lets a caller advance several simulators side by side, see run_simulations.
+        """
+        if self.event_log == "json":
+            self.events = []
+            for event in self.iter_events():
+                self.events.append(event)
+                yield event
+            with open(f"{self.test_name}_events.json", "w") as outfile:
+                dict = json.dumps(self.events, cls=ComplexEncoder, indent=4)
+                outfile.write(dict)
+
+        elif self.event_log == "jsonl":
+            with JsonLinesEventWriter(f"{self.test_name}_events.jsonl") as writer:
+                for event in self.iter_events():
+                    writer.write(event)
+                    yield event
+        else:
+            yield from self.iter_events()
+
+    def iter_events(self):
+        """Runs the simulation, yielding every event once it has been processed
+
+        Unlike Simulate, nothing is kept or written once an event has been yielded, so memory use does not grow with
+        the length of the run. The logs are closed when the simulation ends or the generator is closed.
+        """
         # print("-----  Sliding Window Network Simulator Version -------- \n")
 
-        events = []
+        try:
+            yield from self._process_events()
+        finally:
+            if self.trace is not None:
+                self.trace.close()
+            else:
+                self.A_as_sender_log.close()
+                self.B_as_sender_log.close()
+
+    def _process_events(self):
+        # Looking a member up on an Enum class is slow compared to comparing the int codes, so do it once per run
+        FROM_APPLICATION_LAYER = EventType.FROM_APPLICATION_LAYER
+        FROM_NETWORK_LAYER = EventType.FROM_NETWORK_LAYER
+        TIMER_INTERRUPT = EventType.TIMER_INTERRUPT
 
         while self.continue_simulation:
             # print("Simulation loop - Remaining Events: ", len(self.event_list))
@@ -81,20 +186,26 @@ class NetworkSimulator:
                 # print("Simulator terminated at time {} after sending {} msgs from layer5\n".format(self.time, self.nsim))
             else:
                 # Get the next event to simulate
-                cur_event = self.event_list.pop(0)
-                events.append(cur_event)
+                cur_event = self.event_list.pop()
+
+                # Skip timers that were stopped or restarted after this event was scheduled
+                if cur_event.evtype == TIMER_INTERRUPT:
+                    handle = self.timer_handles.pop(cur_event)
+                    if self.timers.get((cur_event.eventity, handle)) is not cur_event:
+                        continue
+                    del self.timers[(cur_event.eventity, handle)]
 
                 # update our time value to the time of the next event
                 self.time = cur_event.evtime
 
                 # This is an event containing new data from the application layer
-                if cur_event.evtype == EventType.FROM_APPLICATION_LAYER:
+                if cur_event.evtype == FROM_APPLICATION_LAYER:
                     # Set up the next packet to arrive after this one
                     self.generate_next_arrival()
 
                     payload = self.generate_payload()
 
-                    events[-1].pkt = payload
+                    cur_event.pkt = payload
 
                     # Incrememnt the number of packets that have been simulated
                     self.nsim += 1
@@ -119,7 +230,9 @@ class NetworkSimulator:
                     )
 
                 # This is an event being passed up from the network layer
-                elif cur_event.evtype == EventType.FROM_NETWORK_LAYER:
+                elif cur_event.evtype == FROM_NETWORK_LAYER:
+                    self.consume_arrival(cur_event.eventity)
+
                     # Log this event
                     self.print_entity_message(
                         cur_event.eventity, "Rcvd from Network Layer", cur_event.pkt
@@ -146,7 +259,7 @@ class NetworkSimulator:
                     )
 
                 # This is a timer interrupt event
-                elif cur_event.evtype == EventType.TIMER_INTERRUPT:
+                elif cur_event.evtype == TIMER_INTERRUPT:
                     print(
                         f"Timer interrupt for packet {self.time} at {cur_event.eventity.name}"
                     )
@@ -156,16 +269,12 @@ class NetworkSimulator:
                     self.print_to_log(
                         cur_event.eventity, cur_event.eventity, "Timer Interrupt", None
                     )
-                    self.Host[cur_event.eventity].timer_interrupt()
-
-        self.A_as_sender_log.close()
-        self.B_as_sender_log.close()
-
-        with open(f"{self.test_name}_events.json", "w") as outfile:
-            dict = json.dumps(events, cls=ComplexEncoder, indent=4)
-            outfile.write(dict)
+                    if handle is None:
+                        self.Host[cur_event.eventity].timer_interrupt()
+                    else:
+                        self.Host[cur_event.eventity].timer_interrupt(handle)
 
-        return events
+                yield cur_event
 
     def opposite_entity(self, entity):
         if entity == EventEntity.A:
@@ -200,28 +309,14 @@ class NetworkSimulator:
         pass
 
     def create_entity_log_message(self, entity, message, bytes):
-        msg = "{} @ {:.4f}: {}".format(entity.name, self.time, message)
-
-        if bytes:
-            try:
-                pkt = self.Host[entity].unpack_pkt(bytes)
-                if pkt:
-                    # If this is a data packet
-                    if pkt["packet_type"] == 0x00:
-                        msg += f": [TYPE: DATA, SEQ: {pkt['seq_num']}, CKSUM: {pkt['checksum']}, LEN: {pkt['payload_length']}, PAYLOAD: {pkt['payload']}]"
-                    elif pkt["packet_type"] == 0x01:
-                        msg += f": [TYPE: ACK, SEQ: {pkt['seq_num']}, CKSUM: {pkt['checksum']}]"
-
-            except struct.error as e:
-                # Likely indicates a corrupted packet
-                msg += " -- EXCEPTION: " + str(e)
-            except Exception as e:
-                # Some other exception, probably raised by student code
-                msg += " -- EXCEPTION: " + str(e)
-
-        return msg
+        return format_log_message(entity, self.time, message, bytes, self.Host[entity])
 
     def print_to_log(self, sending_entity, event_entity, message, bytes):
+        # In binary trace mode the record is stored as is and formatted later, see binary_trace.py
+        if self.trace is not None:
+            self.trace.record(self.time, sending_entity, event_entity, message, bytes)
+            return
+
         msg = self.create_entity_log_message(event_entity, message, bytes)
         if sending_entity == EventEntity.A:
             self.A_as_sender_log.write(msg + "\n")
@@ -232,7 +327,7 @@ class NetworkSimulator:
         # Create a simulated message for this packet
         j = self.nsim % 26
         msg2give = ""
-        length = random.randint(2, 5)
+        length = self.random.randint(2, 5)
         for i in range(0, length):
             msg2give += chr(97 + j)
         return msg2give
@@ -246,7 +341,7 @@ class NetworkSimulator:
 
             # Determine when this simulated event will occur
             x = (
-                self.arrival_rate * random.uniform(0.0, 1.0) * 2
+                self.arrival_rate * self.random.uniform(0.0, 1.0) * 2
             )  # x is uniform on [0,2*lambda], having mean of lambda
             new_event.evtime = self.time + x
 
@@ -254,7 +349,7 @@ class NetworkSimulator:
             new_event.evtype = EventType.FROM_APPLICATION_LAYER
 
             # Determine which host is receiving this event, A or B
-            if random.uniform(0.0, 1.0) > 0.5:
+            if self.random.uniform(0.0, 1.0) > 0.5:
                 new_event.eventity = EventEntity.A
             else:
                 new_event.eventity = EventEntity.B
@@ -263,36 +358,38 @@ class NetworkSimulator:
             self.insert_event(new_event)
 
     def insert_event(self, new_event):
-        # If queue is empty, add as head and don't connect any adjacent events
-        if len(self.event_list) == 0:
-            self.event_list.append(new_event)
-        else:
-            # check to see if this event occurs before the first element
-            if new_event.evtime < self.event_list[0].evtime:
-                self.event_list.insert(0, new_event)
-            # check to see if this event occurs after the last element\
-            elif new_event.evtime > self.event_list[-1].evtime:
-                self.event_list.append(new_event)
-            else:
-                for idx, e in enumerate(self.event_list):
-                    if new_event.evtime < e.evtime:
-                        self.event_list.insert(idx, new_event)
-                        break
+        self.event_list.push(new_event)
+
+    def schedule_arrival(self, arrival_event):
+        destination = arrival_event.eventity
+        tail = self.channel_tail[destination]
+        if tail is None or arrival_event.evtime > tail:
+            self.channel_tail[destination] = arrival_event.evtime
+        self.channel_in_flight[destination] += 1
+        self.insert_event(arrival_event)
+
+    def consume_arrival(self, destination):
+        self.channel_in_flight[destination] -= 1
+        if self.channel_in_flight[destination] == 0:
+            self.channel_tail[destination] = None
 
     def print_event_list(self, trace_level):
-        for e in self.event_list:
+        for e in self.event_list.ordered():
             # self.trace("Event time: {}, type: {} entity: {}".format(e.evtime, e.evtype, e.eventity),trace_level)
             pass
 
     def packet_is_ack(self, packet):
         # Determine if this is an ACK packet based on the first byte
-        return struct.unpack("!H", packet[0:2])[0] == 0x1
+        return PACKET_TYPE.unpack_from(packet)[0] == 0x1
 
     # ******** DO NOT CALL ANY ROUTINES IN Simulator ABOVE THESE LINES ********
     # *********************** Student callable routines ***********************
     # ********* You will need to call the routines below these lines **********
 
     def pass_to_network_layer(self, entity, packet):
+        # Packets travel through the medium by reference. bytes(packet) returns a bytes packet itself and takes a
+        # snapshot of anything mutable (e.g. a bytearray), so the sending host cannot change a packet in flight.
+        packet = bytes(packet)
         self.ntolayer3 += 1
 
         # Determine if this is an ACK packet based on the first byte
@@ -313,7 +410,7 @@ class NetworkSimulator:
             self.print_to_log(entity, entity, "Passing to Network Layer", packet)
 
         # Simulate losses
-        if random.uniform(0.0, 1.0) < self.lossprob:
+        if self.random.uniform(0.0, 1.0) < self.lossprob:
             self.nlost += 1
             self.print_entity_message(entity, "LOSING PACKET!", None)
             if is_ACK:
@@ -326,7 +423,7 @@ class NetworkSimulator:
             loss_event = SimulatedEvent()
             loss_event.evtype = EventType.PACKET_LOSS
             loss_event.eventity = entity
-            loss_event.pkt = copy.deepcopy(packet)
+            loss_event.pkt = packet
             self.insert_event(loss_event)
 
             # self.trace("TOLAYER3: PACKET BEING LOST", 0)
@@ -337,14 +434,7 @@ class NetworkSimulator:
         else:
             self.Host[self.opposite_entity(entity)].num_data_received += 1
 
-        # make a copy of the packet student just gave me since he/she may decide
-        # to do something with the packet after we return back to him/her
-        pkt = copy.deepcopy(packet)
-        try:
-            # self.trace("TOLAYER3: seq: {}, ack {}, check: {}, {}".format(pkt.seqnum, pkt.acknum, pkt.checksum, pkt.payload), 2)
-            pass
-        except Exception:
-            pass
+        pkt = packet
 
         new_event = SimulatedEvent()
         new_event.evtype = EventType.FROM_NETWORK_LAYER
@@ -357,14 +447,15 @@ class NetworkSimulator:
         # medium can not reorder, so make sure packet arrives between 1 and 10
         # time units after the latest arrival time of packets
         # currently in the medium on their way to the destination
+        # NOTE: this has always looked up the channel towards the *sending* entity. It is kept that way so that
+        # arrival times for a given seed match the expected results in tests/test_cases.
         last_time = self.time
-        for e in self.event_list:
-            if e.evtype == EventType.FROM_NETWORK_LAYER and e.eventity == entity:
-                last_time = e.evtime
-        new_event.evtime = last_time + 0.1 + 0.9 * random.uniform(0.0, 1.0)
+        if self.channel_tail[entity] is not None:
+            last_time = self.channel_tail[entity]
+        new_event.evtime = last_time + 0.1 + 0.9 * self.random.uniform(0.0, 1.0)
 
         # simulate corruption
-        if random.uniform(0.0, 1.0) < self.corruptprob:
+        if self.random.uniform(0.0, 1.0) < self.corruptprob:
             self.ncorrupt += 1
             self.print_entity_message(entity, "CORRUPTING PACKET!", None)
             if is_ACK:
@@ -374,13 +465,12 @@ class NetworkSimulator:
             else:
                 self.print_to_log(entity, entity, "CORRUPTING PACKET!", packet)
 
-            # Flip a random bit
-            bytenum = random.randint(0, len(pkt) - 1)
-            bitnum = random.randint(0, 7)
+            # Flip a random bit. This is the only place where the medium copies a packet; the sender's packet (still
+            # referenced by the corrupt event and possibly by the host's retransmission buffer) is left untouched.
+            bytenum = self.random.randint(0, len(pkt) - 1)
+            bitnum = self.random.randint(0, 7)
             values = bytearray(pkt)
-            altered_value = values[bytenum]
-            bit_mask = 1 << bitnum
-            values[bytenum] = altered_value ^ bit_mask
+            values[bytenum] ^= 1 << bitnum
             new_event.pkt = bytes(values)
 
             corrupt_event = SimulatedEvent()
@@ -390,7 +480,7 @@ class NetworkSimulator:
             self.insert_event(corrupt_event)
 
         # self.trace("TOLAYER3: scheduling arrival on other side", 2)
-        self.insert_event(new_event)
+        self.schedule_arrival(new_event)
 
     def pass_to_application_layer(self, entity, data):
         # Log this event
@@ -405,22 +495,28 @@ class NetworkSimulator:
             None,
         )
 
-    def start_timer(self, entity, increment):
+    def start_timer(self, entity, increment, handle=None):
+        """Starts a timer that calls timer_interrupt on the given entity after increment time units.
+
+        Each entity may run any number of independent timers, identified by handle. Hosts that only need a single
+        timer can leave handle as None, in which case timer_interrupt() is called without arguments; otherwise
+        timer_interrupt(handle) is called. Starting and stopping a timer are both O(1) dictionary operations plus a
+        single push into the event list.
+        """
         # Check to see if a timer has already been started
-        for e in self.event_list:
-            if e.evtype == EventType.TIMER_INTERRUPT and e.eventity == entity:
-                self.print_entity_message(
-                    entity,
-                    "WARNING: ATTEMPTED TO START TIMER WHILE ONE IS ALREADY RUNNING",
-                    None,
-                )
-                self.print_to_log(
-                    entity,
-                    entity,
-                    "WARNING: ATTEMPTED TO START TIMER WHILE ONE IS ALREADY RUNNING",
-                    None,
-                )
-                return
+        if (entity, handle) in self.timers:
+            self.print_entity_message(
+                entity,
+                "WARNING: ATTEMPTED TO START TIMER WHILE ONE IS ALREADY RUNNING",
+                None,
+            )
+            self.print_to_log(
+                entity,
+                entity,
+                "WARNING: ATTEMPTED TO START TIMER WHILE ONE IS ALREADY RUNNING",
+                None,
+            )
+            return
 
         print(f"Starting timer for {entity.name} at time {self.time}")
         self.print_entity_message(entity, "Starting Timer", None)
@@ -430,22 +526,17 @@ class NetworkSimulator:
         new_event.evtime = self.time + increment
         new_event.evtype = EventType.TIMER_INTERRUPT
         new_event.eventity = entity
+        self.timers[(entity, handle)] = new_event
+        self.timer_handles[new_event] = handle
         self.insert_event(new_event)
 
-    def stop_timer(self, entity):
-        for idx, e in enumerate(self.event_list):
-            if e.eventity == entity:
-                if e.evtype == EventType.TIMER_INTERRUPT:
-                    print(f"Stopping timer for {entity.name} at time {self.time}")
-                    self.event_list.pop(
-                        idx
-                    )  # Remove the first timer event associated with this entity
-                    self.print_entity_message(entity, "Stopping Timer", None)
-                    self.print_to_log(entity, entity, "Stopping Timer", None)
-                    return
-                else:
-                    # No timer event to stop
-                    pass
+    def stop_timer(self, entity, handle=None):
+        if self.timers.pop((entity, handle), None) is not None:
+            print(f"Stopping timer for {entity.name} at time {self.time}")
+            self.print_entity_message(entity, "Stopping Timer", None)
+            self.print_to_log(entity, entity, "Stopping Timer", None)
+            return
+
         self.print_entity_message(
             entity, "ERROR: ATTEMPTED TO STOP A TIMER BUT NONE WERE RUNNING", None
         )
@@ -456,23 +547,115 @@ class NetworkSimulator:
             None,
         )
 
+    def timer_running(self, entity, handle=None):
+        return (entity, handle) in self.timers
+
+
+def run_simulations(simulators):
+    """Runs several simulators to completion in this process, advancing them one event at a time in turn
+
+    Each simulator draws from its own random generator, so interleaving them changes nothing: every simulator
+    processes exactly the events, and writes exactly the logs, that it would have when run on its own. A simulator
+    whose host raises an exception stops there; the others carry on.
+
+    Args:
+        simulators (list): the NetworkSimulators to run
+    Returns:
+        list: for every simulator, None if it ran to completion, otherwise the exception that stopped it
+    """
+    errors = [None] * len(simulators)
+    running = {idx: simulator.simulation() for idx, simulator in enumerate(simulators)}
+    while running:
+        for idx, steps in list(running.items()):
+            try:
+                next(steps)
+            except StopIteration:
+                del running[idx]
+            except Exception as e:
+                errors[idx] = e
+                del running[idx]
+    return errors
+
+
+def format_log_message(entity, time, message, bytes, host):
+    """Formats a line of the --ASending.log / --BSending.log files, using host to unpack the packet (if any)"""
+    msg = "{} @ {:.4f}: {}".format(entity.name, time, message)
+
+    if bytes:
+        try:
+            pkt = host.unpack_pkt(bytes)
+            if pkt:
+                # If this is a data packet
+                if pkt["packet_type"] == 0x00:
+                    msg += f": [TYPE: DATA, SEQ: {pkt['seq_num']}, CKSUM: {pkt['checksum']}, LEN: {pkt['payload_length']}, PAYLOAD: {pkt['payload']}]"
+                elif pkt["packet_type"] == 0x01:
+                    msg += f": [TYPE: ACK, SEQ: {pkt['seq_num']}, CKSUM: {pkt['checksum']}]"
+
+        except struct.error as e:
+            # Likely indicates a corrupted packet
+            msg += " -- EXCEPTION: " + str(e)
+        except Exception as e:
+            # Some other exception, probably raised by student code
+            msg += " -- EXCEPTION: " + str(e)
+
+    return msg
+
+
+class EventQueue:
+    """Priority queue of pending SimulatedEvents ordered by event time.
+
+    Events are stored in a binary heap keyed on (evtime, sequence), where sequence is a running insertion counter.
+    Events scheduled for the same time are therefore returned in the order they were inserted, which matches the
+    ordering of the original sorted-list implementation. Pushing and popping an event costs O(log n).
+    """
 
-class SimulatedEvent:
     def __init__(self):
-        self.evtime = 0
-        self.evtype = None
-        self.eventity = None
-        self.pkt = None
-        self.previous_event = None
-        self.next_event = None
+        self._heap = []
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self):
+        # Iterates in heap order, which is NOT sorted by time. Use ordered() when the order matters.
+        return (entry[2] for entry in self._heap)
+
+    def push(self, event):
+        heapq.heappush(self._heap, (event.evtime, next(self._counter), event))
+
+    def pop(self):
+        return heapq.heappop(self._heap)[2]
+
+    def peek(self):
+        return self._heap[0][2]
+
+    def ordered(self):
+        """Returns the pending events sorted by (evtime, insertion order)"""
+        return [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[:2])]
+
+
+class SimulatedEvent:
+    """A pending or processed simulator event
+
+    Long runs create one of these for every arrival, loss, corruption and timer, so instances have no __dict__ and
+    the event type is stored as a small int code (an EventType member).
+    """
+
+    __slots__ = ("evtime", "evtype", "eventity", "pkt")
 
+    def __init__(self, evtime=0, evtype=None, eventity=None, pkt=None):
+        self.evtime = evtime
+        self.evtype = evtype
+        self.eventity = eventity
+        self.pkt = pkt
 
-class EventType(str, Enum):
-    FROM_APPLICATION_LAYER = "FROM_APPLICATION_LAYER"
-    FROM_NETWORK_LAYER = "FROM_NETWORK_LAYER"
-    TIMER_INTERRUPT = "TIMER_INTERRUPT"
-    CORRUPT_PACKET = "CORRUPT_PACKET"
-    PACKET_LOSS = "PACKET_LOSS"
+
+class EventType(IntEnum):
+    FROM_APPLICATION_LAYER = 0
+    FROM_NETWORK_LAYER = 1
+    TIMER_INTERRUPT = 2
+    CORRUPT_PACKET = 3
+    PACKET_LOSS = 4
 
 
 class EventEntity(IntEnum):
@@ -483,7 +666,41 @@ class EventEntity(IntEnum):
 class ComplexEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, SimulatedEvent):
-            obj_dict = {key: str(obj.__dict__[key]) for key in obj.__dict__}
+            obj_dict = {
+                "evtime": str(obj.evtime),
+                "evtype": "None" if obj.evtype is None else "EventType." + obj.evtype.name,
+                "eventity": str(obj.eventity),
+                "pkt": str(obj.pkt),
+                # Events used to be linked list nodes. The fields are gone, but stay in the output so that the format
+                # of _events.json does not change.
+                "previous_event": "None",
+                "next_event": "None",
+            }
             return obj_dict
         # Let the base class default method raise the TypeError
         return json.JSONEncoder.default(self, obj)
+
+
+class JsonLinesEventWriter:
+    """Writes events to a JSON Lines file as they are processed, one JSON object per line
+
+    Each line holds the same fields as an entry of _events.json, so the file can be read incrementally with
+    json.loads(line) instead of loading the whole run at once.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "w")
+        self.encoder = ComplexEncoder()
+
+    def write(self, event):
+        self.file.write(self.encoder.encode(event))
+        self.file.write("\n")
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
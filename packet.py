@@ -0,0 +1,150 @@
+"""Zero-copy access to the fields of packets built by the RDT hosts
+
+Both packet types share an 8 byte header:
+    packet_type (unsigned half), seq_num (unsigned int), checksum (unsigned half)
+Data packets follow the header with:
+    payload_length (unsigned int), payload (payload_length bytes)
+"""
+
+from struct import Struct, error
+
+from internet_checksum import (
+    ONES_COMPLEMENT_MODULUS,
+    internet_checksum,
+    internet_checksum_excluding,
+    update_checksum,
+)
+
+HEADER = Struct("!HIH")
+PAYLOAD_LENGTH = Struct("!I")
+DATA_HEADER = Struct("!HIHI")
+
+HEADER_SIZE = HEADER.size
+DATA_HEADER_SIZE = HEADER.size + PAYLOAD_LENGTH.size
+CHECKSUM_OFFSET = 6
+
+DATA_PACKET = 0x0
+ACK_PACKET = 0x1
+
+# Compiled data packet formats, keyed by payload length
+_data_structs = {}
+
+# Checksum of an ACK packet with a seq_num of 0. Other ACKs only differ in the seq_num field, so their checksums are
+# derived from this one (see build_ack_pkt).
+ACK_BASE_CHECKSUM = internet_checksum(HEADER.pack(ACK_PACKET, 0, 0))
+
+
+def build_data_pkt(seq_num, payload):
+    """Build a data packet with a single pack call
+
+    Every field starts on a 16-bit boundary, so the one's complement sum of the packet is congruent (modulo 0xFFFF) to
+    the sum of the field values, with the payload read as one big-endian integer. This gives the checksum before the
+    packet is packed, so the packet is never packed with a placeholder checksum and then packed again.
+
+    Args:
+        seq_num (int): the sequence number of this packet
+        payload (bytes): the encoded payload
+    Returns:
+        bytes: the packed data packet
+    """
+    payload_length = len(payload)
+    packed = _data_structs.get(payload_length)
+    if packed is None:
+        packed = _data_structs[payload_length] = Struct(
+            DATA_HEADER.format + "%is" % payload_length
+        )
+
+    total = int.from_bytes(payload, "big")
+    if payload_length % 2:
+        total <<= 8
+    total += DATA_PACKET + seq_num + payload_length
+    if total == 0:
+        checksum = 0xFFFF
+    else:
+        checksum = ~(total % ONES_COMPLEMENT_MODULUS or ONES_COMPLEMENT_MODULUS) & 0xFFFF
+
+    return packed.pack(DATA_PACKET, seq_num, checksum, payload_length, payload)
+
+
+def build_ack_pkt(seq_num):
+    """Build an ACK packet with a single pack call
+
+    The checksum is updated from ACK_BASE_CHECKSUM for the new seq_num field (see internet_checksum.update_checksum),
+    without packing the packet twice.
+
+    Args:
+        seq_num (int): the sequence number being acknowledged
+    Returns:
+        bytes: the packed ACK packet
+    """
+    return HEADER.pack(ACK_PACKET, seq_num, update_checksum(ACK_BASE_CHECKSUM, 0, seq_num))
+
+
+class PacketView:
+    """A read-only view over a received packet
+
+    The header is parsed once when the view is created. The payload length and payload are only read from the
+    underlying buffer the first time they are needed, and the checksum is verified in place without copying the
+    packet.
+
+    Raises:
+        struct.error: if the buffer is too short to contain a packet header
+    """
+
+    __slots__ = ("buffer", "packet_type", "seq_num", "checksum", "_payload_length")
+
+    def __init__(self, packet):
+        self.buffer = memoryview(packet)
+        self.packet_type, self.seq_num, self.checksum = HEADER.unpack_from(self.buffer)
+        self._payload_length = None
+
+    def is_ack(self):
+        return self.packet_type == ACK_PACKET
+
+    @property
+    def payload_length(self):
+        """The payload length field of a data packet
+
+        Raises:
+            struct.error: if the buffer is too short to contain the payload length
+        """
+        if self._payload_length is None:
+            (self._payload_length,) = PAYLOAD_LENGTH.unpack_from(self.buffer, HEADER_SIZE)
+        return self._payload_length
+
+    @property
+    def payload(self):
+        """The payload of a data packet as bytes
+
+        Raises:
+            struct.error: if the buffer is shorter than the payload length claims, which usually means that the
+                payload_length field has been corrupted
+        """
+        end = DATA_HEADER_SIZE + self.payload_length
+        if len(self.buffer) < end:
+            raise error(f"unpack requires a buffer of {end} bytes")
+        return self.buffer[DATA_HEADER_SIZE:end].tobytes()
+
+    def is_corrupt(self):
+        """Whether the checksum in the header does not match the packet contents
+
+        ACK packets are checked over their header. Data packets are checked over their header and up to
+        payload_length bytes of payload. A data packet too short to hold a payload length is always corrupt.
+        """
+        if self.packet_type == ACK_PACKET:
+            covered = self.buffer[:HEADER_SIZE]
+        else:
+            covered = self.buffer[: DATA_HEADER_SIZE + self.payload_length]
+        return internet_checksum_excluding(covered, CHECKSUM_OFFSET) != self.checksum
+
+    def as_dict(self):
+        """The packet's fields in the dictionary format returned by GBNHost.unpack_pkt"""
+        unpacked_data = {
+            "packet_type": self.packet_type,
+            "seq_num": self.seq_num,
+            "checksum": self.checksum,
+        }
+        if self.packet_type != ACK_PACKET:
+            unpacked_data["payload_length"] = self.payload_length
+            unpacked_data["payload"] = self.payload
+        return unpacked_data
@@ -0,0 +1,136 @@
+"""Per-event-type profiling of a simulation run
+
+SimulationProfiler runs a NetworkSimulator and records, for every event type, how many events were processed and how
+much wall time (perf_counter_ns) they took, split between host code and simulator code, as well as the deepest the
+event list got. Time spent writing the logs is reported as well; it is part of the simulator time.
+
+The profiler works by wrapping, on the simulator and host instances only, the host callbacks that the simulator
+calls (receive_from_application_layer, receive_from_network_layer, timer_interrupt), the simulator routines that the
+hosts call (pass_to_network_layer, pass_to_application_layer, start_timer, stop_timer) and the log writers. Nothing in
+the simulator checks whether it is being profiled, so a run without a profiler pays nothing at all.
+"""
+
+from time import perf_counter_ns
+
+from network_simulator import EventType
+
+HOST_CALLBACKS = ["receive_from_application_layer", "receive_from_network_layer", "timer_interrupt"]
+SIMULATOR_ROUTINES = ["pass_to_network_layer", "pass_to_application_layer", "start_timer", "stop_timer"]
+LOG_WRITERS = ["print_to_log", "print_entity_message"]
+
+
+class SimulationProfiler:
+    def __init__(self, simulator):
+        self.simulator = simulator
+
+        # Running totals, updated by the wrappers
+        self.host_ns = 0
+        self.routine_ns = 0
+        self.log_ns = 0
+
+        self.event_types = {}
+        self.max_queue_depth = len(simulator.event_list)
+
+        for host in (simulator.A, simulator.B):
+            for name in HOST_CALLBACKS:
+                setattr(host, name, self.wrap_host_callback(getattr(host, name)))
+        for name in SIMULATOR_ROUTINES:
+            setattr(simulator, name, self.wrap_simulator_routine(getattr(simulator, name)))
+        for name in LOG_WRITERS:
+            setattr(simulator, name, self.wrap_log_writer(getattr(simulator, name)))
+
+    def wrap_host_callback(self, callback):
+        def profiled(*args):
+            routine_ns = self.routine_ns
+            start = perf_counter_ns()
+            try:
+                return callback(*args)
+            finally:
+                # Simulator routines called back by the host are simulator time
+                self.host_ns += perf_counter_ns() - start - (self.routine_ns - routine_ns)
+
+        return profiled
+
+    def wrap_simulator_routine(self, routine):
+        def profiled(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return routine(*args, **kwargs)
+            finally:
+                self.routine_ns += perf_counter_ns() - start
+
+        return profiled
+
+    def wrap_log_writer(self, writer):
+        def profiled(*args):
+            start = perf_counter_ns()
+            try:
+                return writer(*args)
+            finally:
+                self.log_ns += perf_counter_ns() - start
+
+        return profiled
+
+    def run(self):
+        """Runs the simulation to completion, exactly as Simulate would, while recording the profile
+
+        Returns:
+            the return value of Simulate
+        """
+        simulator = self.simulator
+        host_ns = self.host_ns
+        log_ns = self.log_ns
+        start = perf_counter_ns()
+
+        # The time from one processed event to the next belongs to the second one. This includes the time spent
+        # popping it from the event list (and discarding any stopped timers in front of it).
+        for event in simulator.simulation():
+            now = perf_counter_ns()
+            stats = self.event_types.get(event.evtype)
+            if stats is None:
+                stats = self.event_types[event.evtype] = {
+                    "count": 0,
+                    "total_ns": 0,
+                    "host_ns": 0,
+                    "simulator_ns": 0,
+                    "log_ns": 0,
+                }
+            stats["count"] += 1
+            stats["total_ns"] += now - start
+            stats["host_ns"] += self.host_ns - host_ns
+            stats["simulator_ns"] += now - start - (self.host_ns - host_ns)
+            stats["log_ns"] += self.log_ns - log_ns
+
+            queue_depth = len(simulator.event_list)
+            if queue_depth > self.max_queue_depth:
+                self.max_queue_depth = queue_depth
+
+            host_ns = self.host_ns
+            log_ns = self.log_ns
+            start = perf_counter_ns()
+
+        return simulator.events
+
+    def report(self):
+        """The recorded profile as a dictionary, with an entry per event type name under "event_types" """
+        return {
+            "event_types": {
+                EventType(evtype).name: dict(stats) for evtype, stats in sorted(self.event_types.items())
+            },
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+    def format_report(self):
+        report = self.report()
+        lines = [
+            f"{'event type':<24} {'count':>8} {'total ms':>10} {'host ms':>10} {'simulator ms':>13} {'log ms':>10} "
+            f"{'us/event':>9}"
+        ]
+        for name, stats in report["event_types"].items():
+            lines.append(
+                f"{name:<24} {stats['count']:>8} {stats['total_ns'] / 1e6:>10.2f} {stats['host_ns'] / 1e6:>10.2f} "
+                f"{stats['simulator_ns'] / 1e6:>13.2f} {stats['log_ns'] / 1e6:>10.2f} "
+                f"{stats['total_ns'] / stats['count'] / 1e3:>9.2f}"
+            )
+        lines.append(f"Event list high-water mark: {report['max_queue_depth']}")
+        return "\n".join(lines)
@@ -1,15 +1,45 @@
+import contextlib
+import cProfile
+import io
 import json
 import os
+import random
 import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from optparse import OptionParser
 
+from congestion_control import CONGESTION_CONTROL
 from gbn_host import GBNHost
-from network_simulator import NetworkSimulator
+from network_simulator import DEFAULT_WINDOW_SIZE, NetworkSimulator, run_simulations
+from metrics import SimulationMetrics
+from profiling import SimulationProfiler
+from sr_host import SRHost
+
+# The RDT host implementations that can be selected with --protocol
+PROTOCOLS = {
+    "gbn": GBNHost,
+    "sr": SRHost,
+}
 
 
 class RDTTester:
-    def __init__(self, RDTImpl):
+    def __init__(self, RDTImpl, profile_dir=None, profile_events=False, metrics_dir=None):
+        """
+        Args:
+            RDTImpl (class): the host implementation to test
+            profile_dir (string): if set, every test runs under cProfile and its stats are written to
+                <profile_dir>/<test>.prof
+            profile_events (bool): print a per-event-type profile of every test (see profiling.py)
+            metrics_dir (string): if set, the delivery metrics of every test (see metrics.py) are written to
+                <metrics_dir>/<test>_metrics.json and <metrics_dir>/<test>_metrics_*.csv
+        """
         self.RDTImpl = RDTImpl
+        self.profile_dir = profile_dir
+        self.profile_events = profile_events
+        self.metrics_dir = metrics_dir
 
         self.op = OptionParser(
             version="0.1a", description="CPSC 3600 IRC Server application"
@@ -52,34 +82,179 @@ class RDTTester:
             type="int",
             help="The seed to use for random generation",
         )
+        self.op.add_option(
+            "--window_size",
+            metavar="X",
+            type="int",
+            default=DEFAULT_WINDOW_SIZE,
+            help="The window size used by both hosts",
+        )
+        self.op.add_option(
+            "--adaptive_rto",
+            action="store_true",
+            help="Arm timers with a retransmission timeout estimated from measured round trip times",
+        )
+        self.op.add_option(
+            "--fast_retransmit",
+            action="store_true",
+            help="Retransmit after --dup_ack_threshold duplicate ACKs instead of waiting for the timer",
+        )
+        self.op.add_option(
+            "--dup_ack_threshold",
+            metavar="X",
+            type="int",
+            help="The number of duplicate ACKs that triggers a fast retransmit (default 3)",
+        )
+        self.op.add_option(
+            "--delayed_ack",
+            action="store_true",
+            help="Send one cumulative ACK per --ack_every in-order packets, or after --ack_delay",
+        )
+        self.op.add_option(
+            "--ack_every",
+            metavar="X",
+            type="int",
+            help="The number of in-order packets covered by each delayed ACK (default 2)",
+        )
+        self.op.add_option(
+            "--ack_delay",
+            metavar="X",
+            type="float",
+            help="The longest time an in-order packet waits for a delayed ACK (default 0.5)",
+        )
+        self.op.add_option(
+            "--congestion_control",
+            type="choice",
+            choices=sorted(CONGESTION_CONTROL),
+            help="The congestion control policy: fixed or reno, which also turns on fast retransmit (default fixed)",
+        )
+        self.op.add_option(
+            "--trace_format",
+            type="choice",
+            choices=["text", "binary"],
+            help="Write the simulator log as text (default) or as a binary trace to decode later with binary_trace.py",
+        )
+        self.op.add_option(
+            "--global_random",
+            action="store_true",
+            help="Draw from the global random module instead of a generator owned by the simulator",
+        )
+        self.op.add_option(
+            "--event_log",
+            type="choice",
+            choices=["json", "jsonl", "none"],
+            help="Write the processed events to _events.json at the end of the run (default), stream them to "
+            "_events.jsonl, or do not write them",
+        )
 
-    def run_tests(self, tests):
+    def run_tests(self, tests, jobs=1, interleave=False):
+        """Runs the named test cases and reports the failures
+
+        Args:
+            tests (iterable): the names of the test cases in tests/test_cases
+            jobs (int): the number of worker processes to run the tests in; 1 runs them one after another in this
+                process
+            interleave (bool): run all the tests side by side in this process instead (see run_tests_interleaved)
+        Returns:
+            list: a dictionary per test with the keys "test", "passed" and "errors", in the order of tests
+        """
         __location__ = os.path.realpath(
             os.path.join(os.getcwd(), os.path.dirname(__file__))
         )
         if not os.path.exists(os.path.join(__location__, "Logs")):
             os.makedirs(os.path.join(__location__, "Logs"))
 
+        if interleave:
+            return self.run_tests_interleaved(tests, __location__)
+        if jobs > 1:
+            return self.run_tests_in_parallel(tests, jobs, __location__)
+
+        tests = list(tests)
         results = []
+        for test, test_config in zip(tests, self.load_test_configs(tests, __location__)):
+            passed, errors = self.run_test(test, test_config)
+            results.append(self.report_result(test, passed, errors))
+        return results
+
+    def run_tests_in_parallel(self, tests, jobs, location):
+        """Runs the test cases in a pool of worker processes
+
+        Every test writes its own log files and runs in a fresh copy of this process's random state, so its results
+        do not depend on which worker runs it or what that worker ran before. The output of each test is captured in
+        the worker and printed here in the original order, making the output the same as a serial run.
+        """
+        tests = list(tests)
+        test_configs = self.load_test_configs(tests, location)
+
+        random_state = random.getstate()
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            outcomes = pool.map(
+                run_test_in_worker,
+                [self.RDTImpl] * len(tests),
+                tests,
+                test_configs,
+                [random_state] * len(tests),
+                [self.profile_dir] * len(tests),
+                [self.profile_events] * len(tests),
+                [self.metrics_dir] * len(tests),
+            )
+
+            results = []
+            for test, (passed, errors, output) in zip(tests, outcomes):
+                sys.stdout.write(output)
+                results.append(self.report_result(test, passed, errors))
+        return results
+
+    def run_tests_interleaved(self, tests, location):
+        """Runs all the test cases side by side in this process, advancing their simulators one event at a time in
+        turn (see network_simulator.run_simulations)
+
+        Every simulator owns its random generator, so the results are those of a serial run, without the cost of a
+        worker process per test. The output of the tests is interleaved. Not for use with --global_random, where the
+        simulators would share one random sequence.
+        """
+        tests = list(tests)
+        test_configs = self.load_test_configs(tests, location)
+
+        simulators = {}
+        setup_errors = {}
+        for test, test_config in zip(tests, test_configs):
+            try:
+                args = re.findall(r'(?:[^\s,"]|"(?:\\.|[^"])*")+', test_config["options"])
+                options, args = self.op.parse_args(args)
+                simulators[test] = NetworkSimulator(test, options, self.RDTImpl)
+            except Exception as e:
+                setup_errors[test] = e
+
+        run_errors = dict(zip(simulators, run_simulations(list(simulators.values()))))
+
+        results = []
+        for test, test_config in zip(tests, test_configs):
+            error = setup_errors.get(test) or run_errors.get(test)
+            if error is not None:
+                passed, errors = False, error
+            else:
+                passed, errors = self.check_test_results(test_config, simulators[test], None)
+            results.append(self.report_result(test, passed, errors))
+        return results
+
+    def load_test_configs(self, tests, location):
+        test_configs = []
         for test in tests:
-            # Open the test file
             with open(
-                os.path.join(__location__, "tests", "test_cases", "%s.cfg" % test), "r"
+                os.path.join(location, "tests", "test_cases", "%s.cfg" % test), "r"
             ) as fp:
-                test_config = json.load(fp)
-
-                # Redirect all output to a log file for this test
-                # with open(os.path.join(__location__, 'Logs', '%s.log' % test), 'w') as log:
-                passed, errors = self.run_test(test, test_config)
-                results.append({"test": test, "passed": passed, "errors": errors})
-                # sys.stdout = sys.__stdout__
-                if not passed:
-                    print(
-                        "\n%s failed. See the expected and actual state of your code below.\n"
-                        % test
-                    )
-                    print("%s\n" % errors)
-        return results
+                test_configs.append(json.load(fp))
+        return test_configs
+
+    def report_result(self, test, passed, errors):
+        if not passed:
+            print(
+                "\n%s failed. See the expected and actual state of your code below.\n"
+                % test
+            )
+            print("%s\n" % errors)
+        return {"test": test, "passed": passed, "errors": errors}
 
     def run_test(self, test_name, test):
         try:
@@ -92,13 +267,86 @@ class RDTTester:
             # if options.capture_log:
             #    sys.stdout = log
 
-            result = simulator.Simulate()
+            if self.metrics_dir is not None:
+                metrics = SimulationMetrics(simulator)
+
+            if self.profile_events:
+                profiler = SimulationProfiler(simulator)
+                run = profiler.run
+            else:
+                run = simulator.Simulate
+
+            if self.profile_dir is not None:
+                profile = cProfile.Profile()
+                result = profile.runcall(run)
+                profile.dump_stats(
+                    os.path.join(self.profile_dir, "%s.prof" % os.path.basename(test_name))
+                )
+            else:
+                result = run()
+
+            if self.profile_events:
+                print("\nProfile of %s:\n%s\n" % (test_name, profiler.format_report()))
+
+            if self.metrics_dir is not None:
+                prefix = os.path.join(self.metrics_dir, "%s_metrics" % os.path.basename(test_name))
+                metrics.export_json(prefix + ".json")
+                metrics.export_csv(prefix)
 
             return self.check_test_results(test, simulator, result)
 
         except Exception as e:
             return False, e
 
+    def sweep_window_sizes(self, options, window_sizes):
+        """Runs the same scenario once for every window size and reports how each one performed
+
+        Host output is discarded, the events are not written, and the logs go to a temporary directory that is
+        removed afterwards, so that the reported wall-clock time reflects the cost of the simulation itself.
+
+        Args:
+            options (string): the scenario, in the same format as the "options" of a test case
+            window_sizes (list): the window sizes to run
+        Returns:
+            list: a dictionary per window size with the keys "window_size", "delivered", "sim_time", "goodput"
+                (messages delivered per unit of simulated time), "retransmissions", "ntolayer3" and "wall_time"
+                (seconds)
+        """
+        args = re.findall(r'(?:[^\s,"]|"(?:\\.|[^"])*")+', options)
+
+        results = []
+        with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+            for window_size in window_sizes:
+                sweep_options, _ = self.op.parse_args(
+                    args + ["--window_size", str(window_size), "--event_log", "none"]
+                )
+                test_name = os.path.join(tmp, "WindowSweep_%i" % window_size)
+
+                with contextlib.redirect_stdout(devnull):
+                    start = time.perf_counter()
+                    simulator = NetworkSimulator(test_name, sweep_options, self.RDTImpl)
+                    simulator.Simulate()
+                    wall_time = time.perf_counter() - start
+
+                delivered = len(simulator.A.data_received) + len(simulator.B.data_received)
+                data_sent = simulator.A.num_data_sent + simulator.B.num_data_sent
+                results.append(
+                    {
+                        "window_size": window_size,
+                        "delivered": delivered,
+                        "sim_time": simulator.time,
+                        "goodput": delivered / simulator.time if simulator.time else 0.0,
+                        "retransmissions": data_sent - simulator.nsim,
+                        "fast_retransmits": simulator.A.fast_retransmits
+                        + simulator.B.fast_retransmits,
+                        "timeout_retransmits": simulator.A.timeout_retransmits
+                        + simulator.B.timeout_retransmits,
+                        "ntolayer3": simulator.ntolayer3,
+                        "wall_time": wall_time,
+                    }
+                )
+        return results
+
     def check_test_results(self, test, simulator, result):
         passed = True
         debug_message = ""
@@ -344,8 +592,99 @@ class RDTTester:
         return final_list
 
 
+def run_test_in_worker(
+    RDTImpl, test_name, test, random_state, profile_dir=None, profile_events=False, metrics_dir=None
+):
+    """Runs a single test case in a worker process of RDTTester.run_tests_in_parallel
+
+    Returns:
+        tuple: (passed, errors, output), where output is everything the test printed
+    """
+    random.setstate(random_state)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        tester = RDTTester(
+            RDTImpl, profile_dir=profile_dir, profile_events=profile_events, metrics_dir=metrics_dir
+        )
+        passed, errors = tester.run_test(test_name, test)
+    return passed, errors, output.getvalue()
+
+
 if __name__ == "__main__":
 
+    cli = OptionParser(description="Runs the RDT test cases against a host implementation")
+    cli.add_option(
+        "--protocol",
+        type="choice",
+        choices=sorted(PROTOCOLS),
+        default="gbn",
+        help="The host implementation to test: gbn or sr (the expected results are for gbn) [default: %default]",
+    )
+    cli.add_option(
+        "--sweep",
+        action="store_true",
+        help="Instead of running the test cases, run one scenario over a range of window sizes",
+    )
+    cli.add_option(
+        "--sweep_options",
+        metavar="X",
+        default="--num_pkts 1000 --arrival_rate 1 --timer_interval 20 --loss_prob 0.1 --corrupt_prob 0.1 --seed 3600",
+        help="The scenario to sweep, in the format of a test case's options [default: %default]",
+    )
+    cli.add_option(
+        "--window_sizes",
+        metavar="X",
+        default="1,2,4,8,16,32,64,128,256,512,1024",
+        help="Comma separated window sizes to sweep [default: %default]",
+    )
+    cli.add_option(
+        "--interleave",
+        action="store_true",
+        help="Run all the test cases side by side in this process (their output is interleaved, and they are not "
+        "profiled or measured)",
+    )
+    cli.add_option(
+        "--profile",
+        action="store_true",
+        help="Run every test case under cProfile and write its stats to Logs/<test>.prof",
+    )
+    cli.add_option(
+        "--profile_events",
+        action="store_true",
+        help="Print where the time of every test case goes, per event type",
+    )
+    cli.add_option(
+        "--metrics",
+        action="store_true",
+        help="Write the delivery latency, goodput, retransmission and window occupancy metrics of every test case "
+        "to Logs/<test>_metrics.json and Logs/<test>_metrics_*.csv",
+    )
+    cli.add_option(
+        "--jobs",
+        metavar="N",
+        type="int",
+        default=1,
+        help="Run the test cases in N worker processes, or one per core if N is 0 [default: %default]",
+    )
+    cli_options, _ = cli.parse_args()
+
+    if cli_options.sweep:
+        test_manager = RDTTester(PROTOCOLS[cli_options.protocol])
+        sweep = test_manager.sweep_window_sizes(
+            cli_options.sweep_options,
+            [int(w) for w in cli_options.window_sizes.split(",")],
+        )
+
+        print(f"Window size sweep ({cli_options.protocol}): {cli_options.sweep_options}\n")
+        print(
+            f"{'window':>8} {'delivered':>10} {'sim time':>12} {'goodput':>10} {'retransmits':>12} {'fast':>8} {'timeout':>8} {'ntolayer3':>10} {'wall (s)':>9}"
+        )
+        for r in sweep:
+            print(
+                f"{r['window_size']:>8} {r['delivered']:>10} {r['sim_time']:>12.2f} {r['goodput']:>10.4f} {r['retransmissions']:>12} {r['fast_retransmits']:>8} {r['timeout_retransmits']:>8} {r['ntolayer3']:>10} {r['wall_time']:>9.3f}"
+            )
+        sys.exit(0)
+
     tests = {
         "Test1_SlowDataRate_0Loss_0Corruption": 13,
         "Test2_SlowDataRate_25Loss_0Corruption": 6.5,
@@ -361,8 +700,20 @@ if __name__ == "__main__":
         "Test12_FastDataRate_10Loss_10Corruption": 4.0625,
     }
 
-    test_manager = RDTTester(GBNHost)
-    score = test_manager.run_tests(tests.keys())
+    logs_dir = os.path.join(
+        os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(__file__))), "Logs"
+    )
+    test_manager = RDTTester(
+        PROTOCOLS[cli_options.protocol],
+        profile_dir=logs_dir if cli_options.profile else None,
+        profile_events=cli_options.profile_events,
+        metrics_dir=logs_dir if cli_options.metrics else None,
+    )
+    score = test_manager.run_tests(
+        tests.keys(),
+        jobs=cli_options.jobs or os.cpu_count(),
+        interleave=cli_options.interleave,
+    )
 
     print("\n\nTest Results:")
     for s in score:
@@ -0,0 +1,217 @@
+from collections import OrderedDict
+
+from gbn_host import RTO_MAX_BACKOFF, GBNHost
+
+# Number of ACK packets kept by each receiver, see SRHost.get_ack_pkt
+ACK_CACHE_SIZE = 64
+
+
+class SRHost(GBNHost):
+    """A Selective Repeat host with the same interface as GBNHost
+
+    Packets are built, checked and unpacked exactly as in GBNHost. The difference is in the sender and receiver FSMs:
+        - the receiver ACKs every packet individually and buffers packets that arrive out of order, delivering them to
+          the application layer once the gap before them has been filled
+        - the sender runs a separate timer for every unacknowledged packet (using the packet's sequence number as the
+          timer handle) and only retransmits the packet whose timer expired
+
+    A single loss therefore costs a single retransmission, instead of a retransmission of the whole window.
+
+    Every packet's timeout doubles each time its timer expires, up to RTO_MAX_BACKOFF timer intervals. Otherwise a
+    packet that is only queued behind others in the channel would be resent every timer interval, and each resend
+    would lengthen the queue that delays it.
+
+    With fast_retransmit set, ACKs for packets beyond an unacknowledged window base count as duplicate ACKs, and the
+    base packet is resent once dup_ack_threshold of them have arrived.
+    """
+
+    def __init__(self, simulator, entity, timer_interval, window_size, **kwargs):
+        """Initializes important values for SRHost objects
+
+        Args:
+            simulator (NetworkSimulator): the network simulator used to communicate with the other host
+            entity (EventEntity): which entity this is
+            timer_interval (float): the amount of time that should pass before a packet's timer expires
+            window_size (int): the size of both the sender and the receiver window
+            kwargs: the optional GBNHost arguments, e.g. send_queue_high_water or adaptive_rto
+        Returns:
+            nothing
+        """
+        super().__init__(simulator, entity, timer_interval, window_size, **kwargs)
+
+        # The variables are relevant to the SR Sender FSM. unacked_buffer is inherited from GBNHost.
+        self.acked = [False] * window_size
+        self.timeouts = [None] * window_size  # the interval each packet's timer is armed with
+
+        # These variables are relevant to the SR Receiver FSM. expected_seq_num is the base of the receive window.
+        self.rcv_buffer = [None] * window_size
+
+        # Every packet is ACKed individually, and packets that are already buffered or delivered are ACKed again, so
+        # the receiver reuses the ACK packets it built (see get_ack_pkt)
+        self.ack_cache = OrderedDict()
+        self.ack_cache_hits = 0
+        self.ack_cache_misses = 0
+
+    def receive_from_network_layer(self, packet):
+        """Handles a packet arriving from the network layer
+
+        Corrupt packets are dropped; the sender's per-packet timer recovers them.
+
+        Args:
+            packet (bytes): the bytes object containing the packet data
+        Returns:
+            nothing
+        """
+        view = self.parse_pkt(packet)
+        if view is None or self.is_corrupt(view):
+            return
+
+        if view.is_ack():
+            self.receive_ack(view.seq_num)
+        else:
+            try:
+                payload = view.payload.decode()
+            except Exception:
+                # A payload that cannot be extracted is treated like a corrupt packet
+                return
+            self.receive_data(view.seq_num, payload)
+
+    def receive_ack(self, seq_num):
+        if not self.window_base <= seq_num < self.next_seq_num:
+            print(
+                f"Received ACK {seq_num} is outside of the send window [{self.window_base}, {self.next_seq_num}). Ignoring."
+            )
+            return
+
+        slot = seq_num % self.window_size
+        if self.acked[slot]:
+            return
+
+        self.acked[slot] = True
+        self.congestion_control.on_ack(1)
+        self.sample_rtt(seq_num)
+        self.simulator.stop_timer(self.entity, seq_num)
+
+        if seq_num == self.window_base:
+            self.dup_acks = 0
+        elif self.fast_retransmit:
+            self.count_duplicate_ack(seq_num)
+
+        # Slide the window past every packet at its base that has been acknowledged
+        while self.window_base < self.next_seq_num and self.acked[self.window_base % self.window_size]:
+            slot = self.window_base % self.window_size
+            self.acked[slot] = False
+            self.unacked_buffer[slot] = None
+            self.window_base += 1
+
+        self.process_app_layer_buffer()
+
+    def receive_data(self, seq_num, payload):
+        rcv_base = self.expected_seq_num
+
+        if rcv_base <= seq_num < rcv_base + self.window_size:
+            self.simulator.pass_to_network_layer(self.entity, self.get_ack_pkt(seq_num))
+            self.rcv_buffer[seq_num % self.window_size] = payload
+
+            # Deliver the in-order run of buffered packets starting at the base of the receive window
+            while self.rcv_buffer[self.expected_seq_num % self.window_size] is not None:
+                slot = self.expected_seq_num % self.window_size
+                self.simulator.pass_to_application_layer(self.entity, self.rcv_buffer[slot])
+                self.rcv_buffer[slot] = None
+                self.expected_seq_num += 1
+
+        elif rcv_base - self.window_size <= seq_num < rcv_base:
+            # Already delivered, but our ACK may have been lost
+            self.simulator.pass_to_network_layer(self.entity, self.get_ack_pkt(seq_num))
+
+    def get_ack_pkt(self, seq_num):
+        """Return the ACK packet for a sequence number, reusing a previously built one when possible
+
+        ACK packets are immutable, so the receiver keeps the most recently used ACK_CACHE_SIZE of them and only calls
+        create_ack_pkt on a miss. ack_cache_hits and ack_cache_misses count how often each happens.
+
+        Args:
+            seq_num (int): the sequence number being acknowledged
+        Returns:
+            bytes: the ACK packet
+        """
+        pkt = self.ack_cache.get(seq_num)
+        if pkt is not None:
+            self.ack_cache_hits += 1
+            self.ack_cache.move_to_end(seq_num)
+            return pkt
+
+        self.ack_cache_misses += 1
+        pkt = self.ack_cache[seq_num] = self.create_ack_pkt(seq_num)
+        if len(self.ack_cache) > ACK_CACHE_SIZE:
+            self.ack_cache.popitem(last=False)
+        return pkt
+
+    def process_app_layer_buffer(self):
+        """Sends buffered application layer data while the window has space, starting a timer for every packet."""
+        while (
+            len(self.app_layer_buffer) > 0
+            and self.next_seq_num < self.window_base + self.send_window()
+        ):
+            pkt = self.create_data_pkt(self.next_seq_num, self.app_layer_buffer.popleft())
+            self.unacked_buffer[self.next_seq_num % self.window_size] = pkt
+            self.send_times[self.next_seq_num % self.window_size] = self.simulator.time
+            self.retransmitted[self.next_seq_num % self.window_size] = False
+            self.timeouts[self.next_seq_num % self.window_size] = self.current_rto()
+
+            self.simulator.pass_to_network_layer(self.entity, pkt)
+            self.simulator.start_timer(self.entity, self.current_rto(), self.next_seq_num)
+            self.next_seq_num += 1
+
+        self.update_backpressure()
+
+    def count_duplicate_ack(self, seq_num):
+        """Counts an ACK that arrived while the window base is still unacknowledged, resending the base packet at the
+        threshold. At most one fast retransmit is made per window base.
+
+        Args:
+            seq_num (int): the sequence number of the ACK
+        Returns:
+            nothing
+        """
+        self.dup_acks += 1
+        if (
+            self.dup_acks >= self.dup_ack_threshold
+            and self.fast_retransmit_base != self.window_base
+        ):
+            self.fast_retransmit_base = self.window_base
+            self.congestion_control.on_fast_retransmit()
+            self.fast_retransmits += 1
+            slot = self.window_base % self.window_size
+            self.simulator.stop_timer(self.entity, self.window_base)
+            self.simulator.start_timer(self.entity, self.timeouts[slot], self.window_base)
+            self.resend(self.window_base)
+
+    def resend(self, seq_num):
+        """Retransmits a packet in the window. The caller (re)starts its timer."""
+        slot = seq_num % self.window_size
+        print(f"Resending packet {seq_num}")
+        self.retransmitted[slot] = True
+        self.simulator.pass_to_network_layer(self.entity, self.unacked_buffer[slot])
+
+    def timer_interrupt(self, seq_num):
+        """Retransmits the single packet whose timer expired and restarts its timer with a doubled timeout
+
+        Args:
+            seq_num (int): the timer handle, which is the sequence number of the packet
+        Returns:
+            None
+        """
+        if not self.window_base <= seq_num < self.next_seq_num:
+            return
+
+        slot = seq_num % self.window_size
+        if self.acked[slot]:
+            return
+
+        self.back_off_rto()
+        self.congestion_control.on_timeout()
+        self.timeout_retransmits += 1
+        self.timeouts[slot] = min(self.timeouts[slot] * 2, self.timer_interval * RTO_MAX_BACKOFF)
+        self.simulator.start_timer(self.entity, self.timeouts[slot], seq_num)
+        self.resend(seq_num)
@@ -0,0 +1,321 @@
+"""Monte Carlo sweeps of the RDT hosts over grids of channel and host parameters
+
+Every combination of the swept parameters (a cell of the grid) is simulated with seed after seed, and the runs of
+each cell are summarised by the mean of every metric with a 95% confidence interval. Seeds are handed out in batches
+to a pool of worker processes. A cell stops receiving new seeds once the confidence interval of its goodput is
+narrower than the requested precision, or once it has used up its maximum number of runs.
+
+All cells use the same seeds (1, 2, 3...), so differences between cells are not blurred by different random
+sequences.
+
+Usage:
+    python sweep.py --loss_prob 0,0.1,0.2 --window_size 4,8,16 [--options "--num_pkts 500 ..."] [--jobs N]
+"""
+
+import contextlib
+import csv
+import json
+import math
+import os
+import re
+import statistics
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from optparse import OptionParser
+
+from network_simulator import NetworkSimulator
+from rdt_tester import PROTOCOLS, RDTTester
+
+# The parameters that can be swept, in the order in which cells are listed
+SWEEP_PARAMETERS = ["loss_prob", "corrupt_prob", "arrival_rate", "timer_interval", "window_size"]
+
+# The metrics reported for every run. Early stopping looks at the first one.
+METRICS = ["goodput", "retransmission_ratio", "delivered", "sim_time"]
+
+# Two-sided 95% critical values of Student's t distribution for 1 to 30 degrees of freedom. The normal value 1.96 is
+# used beyond that.
+T_CRITICAL_95 = [
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+]
+
+
+def t_critical(df):
+    if df <= len(T_CRITICAL_95):
+        return T_CRITICAL_95[df - 1]
+    return 1.96
+
+
+def summarize(values):
+    """Summarises the values of a metric over the runs of a cell
+
+    Args:
+        values (list): one value per run
+    Returns:
+        dict: "mean", "stdev" and "half_width", the half width of the 95% confidence interval of the mean (infinite
+            for fewer than two runs)
+    """
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return {"mean": mean, "stdev": 0.0, "half_width": math.inf}
+
+    stdev = statistics.stdev(values)
+    half_width = t_critical(len(values) - 1) * stdev / math.sqrt(len(values))
+    return {"mean": mean, "stdev": stdev, "half_width": half_width}
+
+
+def is_precise(summary, precision):
+    """Whether a confidence interval is within precision (relative to the mean) of the mean
+
+    A zero mean only counts as precise when the interval has no width at all.
+    """
+    return summary["half_width"] <= precision * abs(summary["mean"])
+
+
+def run_cell(RDTImpl, args, seeds):
+    """Simulates one cell of the grid with each of the given seeds
+
+    Host output is discarded, the events are not written, and the logs go to a temporary directory that is removed
+    afterwards.
+
+    Args:
+        RDTImpl (class): the host implementation
+        args (list): the simulator options of the cell, as command line arguments
+        seeds (list): the seeds to run
+    Returns:
+        list: the metrics of every run, as a dictionary keyed by the names in METRICS
+    """
+    op = RDTTester(RDTImpl).op
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        for seed in seeds:
+            options, _ = op.parse_args(args + ["--seed", str(seed), "--event_log", "none"])
+            with contextlib.redirect_stdout(devnull):
+                simulator = NetworkSimulator(os.path.join(tmp, "run"), options, RDTImpl)
+                simulator.Simulate()
+
+            delivered = len(simulator.A.data_received) + len(simulator.B.data_received)
+            data_sent = simulator.A.num_data_sent + simulator.B.num_data_sent
+            runs.append(
+                {
+                    "goodput": delivered / simulator.time if simulator.time else 0.0,
+                    "retransmission_ratio": (data_sent - simulator.nsim) / simulator.nsim
+                    if simulator.nsim
+                    else 0.0,
+                    "delivered": delivered,
+                    "sim_time": simulator.time,
+                }
+            )
+    return runs
+
+
+class MonteCarloSweep:
+    """Runs every cell of a parameter grid until its goodput is known to the requested precision
+
+    Args:
+        RDTImpl (class): the host implementation
+        grid (dict): a list of values for each swept parameter (a key of SWEEP_PARAMETERS)
+        options (string): the simulator options shared by all cells, in the format of a test case's options
+        min_runs (int): the number of runs of a cell before it may stop early
+        max_runs (int): the most runs of any cell
+        precision (float): stop a cell once the 95% confidence interval of its mean goodput is within this fraction
+            of the mean
+        batch_size (int): the number of seeds handed to a worker at a time
+        jobs (int): the number of worker processes; 1 runs everything in this process
+    """
+
+    def __init__(
+        self,
+        RDTImpl,
+        grid,
+        options="",
+        min_runs=5,
+        max_runs=100,
+        precision=0.05,
+        batch_size=5,
+        jobs=1,
+    ):
+        for name in grid:
+            if name not in SWEEP_PARAMETERS:
+                raise ValueError(f"cannot sweep {name}, expected one of {', '.join(SWEEP_PARAMETERS)}")
+        if not 1 <= min_runs <= max_runs:
+            raise ValueError("expected 1 <= min_runs <= max_runs")
+
+        self.RDTImpl = RDTImpl
+        self.parameters = [name for name in SWEEP_PARAMETERS if name in grid]
+        self.cells = [
+            dict(zip(self.parameters, values))
+            for values in product(*(grid[name] for name in self.parameters))
+        ]
+        self.args = re.findall(r'(?:[^\s,"]|"(?:\\.|[^"])*")+', options)
+        self.min_runs = min_runs
+        self.max_runs = max_runs
+        self.precision = precision
+        self.batch_size = batch_size
+        self.jobs = jobs
+
+    def cell_args(self, cell):
+        args = list(self.args)
+        for name, value in cell.items():
+            args += [f"--{name}", str(value)]
+        return args
+
+    def is_done(self, runs):
+        if len(runs) >= self.max_runs:
+            return True
+        if len(runs) < self.min_runs:
+            return False
+        return is_precise(summarize([run[METRICS[0]] for run in runs]), self.precision)
+
+    def next_seeds(self, runs):
+        """The seeds of a cell's next round: never fewer than needed to reach min_runs, never past max_runs"""
+        count = max(self.batch_size, self.min_runs - len(runs))
+        count = min(count, self.max_runs - len(runs))
+        return list(range(len(runs) + 1, len(runs) + 1 + count))
+
+    def run(self):
+        """Runs the sweep
+
+        Returns:
+            list: a dictionary per cell with the cell's parameters, "runs" (the number of runs), "converged" (whether
+                the goodput reached the requested precision) and a summary (see summarize) of every metric
+        """
+        runs = [[] for _ in self.cells]
+        pending = [idx for idx in range(len(self.cells)) if not self.is_done(runs[idx])]
+
+        pool = ProcessPoolExecutor(max_workers=self.jobs) if self.jobs > 1 else None
+        try:
+            while pending:
+                # Split every cell's seeds into work items of at most batch_size seeds, so that a few cells with many
+                # seeds to run still keep all the workers busy
+                items = []
+                for idx in pending:
+                    seeds = self.next_seeds(runs[idx])
+                    for start in range(0, len(seeds), self.batch_size):
+                        items.append((idx, self.cell_args(self.cells[idx]), seeds[start : start + self.batch_size]))
+
+                if pool is not None:
+                    outcomes = pool.map(
+                        run_cell,
+                        [self.RDTImpl] * len(items),
+                        [args for _, args, _ in items],
+                        [seeds for _, _, seeds in items],
+                    )
+                else:
+                    outcomes = (run_cell(self.RDTImpl, args, seeds) for _, args, seeds in items)
+
+                for (idx, _, _), outcome in zip(items, outcomes):
+                    runs[idx].extend(outcome)
+                pending = [idx for idx in pending if not self.is_done(runs[idx])]
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        results = []
+        for cell, cell_runs in zip(self.cells, runs):
+            result = dict(cell)
+            result["runs"] = len(cell_runs)
+            for metric in METRICS:
+                result[metric] = summarize([run[metric] for run in cell_runs])
+            result["converged"] = is_precise(result[METRICS[0]], self.precision)
+            results.append(result)
+        return results
+
+
+def write_csv(results, parameters, fp):
+    """Writes sweep results as CSV, with a mean and a confidence interval half width column per metric"""
+    writer = csv.writer(fp)
+    header = list(parameters) + ["runs", "converged"]
+    for metric in METRICS:
+        header += [metric, f"{metric}_ci95"]
+    writer.writerow(header)
+
+    for result in results:
+        row = [result[name] for name in parameters] + [result["runs"], result["converged"]]
+        for metric in METRICS:
+            row += [result[metric]["mean"], result[metric]["half_width"]]
+        writer.writerow(row)
+
+
+def main():
+    op = OptionParser(description="Monte Carlo sweep of the RDT hosts over a parameter grid")
+    for name in SWEEP_PARAMETERS:
+        op.add_option(f"--{name}", metavar="X", help=f"Comma separated values of {name} to sweep")
+    op.add_option(
+        "--options",
+        metavar="X",
+        default="--num_pkts 500 --arrival_rate 1 --timer_interval 20 --loss_prob 0.1 --corrupt_prob 0.1",
+        help="The options shared by all cells, in the format of a test case's options [default: %default]",
+    )
+    op.add_option(
+        "--protocol",
+        type="choice",
+        choices=sorted(PROTOCOLS),
+        default="gbn",
+        help="The host implementation to sweep [default: %default]",
+    )
+    op.add_option("--min_runs", metavar="N", type="int", default=5, help="Runs per cell before stopping early [default: %default]")
+    op.add_option("--max_runs", metavar="N", type="int", default=100, help="The most runs per cell [default: %default]")
+    op.add_option(
+        "--precision",
+        metavar="X",
+        type="float",
+        default=0.05,
+        help="Stop a cell once the 95%% confidence interval of its goodput is within this fraction of the mean "
+        "[default: %default]",
+    )
+    op.add_option("--batch_size", metavar="N", type="int", default=5, help="Seeds per work item [default: %default]")
+    op.add_option(
+        "--jobs",
+        metavar="N",
+        type="int",
+        default=0,
+        help="Worker processes, or one per core if N is 0 [default: %default]",
+    )
+    op.add_option("--csv", metavar="FILE", help="Also write the results to a CSV file")
+    op.add_option("--json", metavar="FILE", help="Also write the results to a JSON file")
+    options, _ = op.parse_args()
+
+    grid = {}
+    for name in SWEEP_PARAMETERS:
+        values = getattr(options, name)
+        if values:
+            cast = int if name == "window_size" else float
+            grid[name] = [cast(value) for value in values.split(",")]
+
+    try:
+        sweep = MonteCarloSweep(
+            PROTOCOLS[options.protocol],
+            grid,
+            options=options.options,
+            min_runs=options.min_runs,
+            max_runs=options.max_runs,
+            precision=options.precision,
+            batch_size=options.batch_size,
+            jobs=options.jobs or os.cpu_count(),
+        )
+    except ValueError as e:
+        op.error(str(e))
+    results = sweep.run()
+
+    header = "".join(f"{name:>15}" for name in sweep.parameters)
+    print(f"{header}{'runs':>6} {'goodput':>20} {'retransmission ratio':>22}")
+    for result in results:
+        cells = "".join(f"{result[name]:>15}" for name in sweep.parameters)
+        goodput = f"{result['goodput']['mean']:.4f} ± {result['goodput']['half_width']:.4f}"
+        ratio = f"{result['retransmission_ratio']['mean']:.4f} ± {result['retransmission_ratio']['half_width']:.4f}"
+        flag = "" if result["converged"] else "  (not converged)"
+        print(f"{cells}{result['runs']:>6} {goodput:>20} {ratio:>22}{flag}")
+
+    if options.csv:
+        with open(options.csv, "w", newline="") as fp:
+            write_csv(results, sweep.parameters, fp)
+    if options.json:
+        with open(options.json, "w") as fp:
+            json.dump(results, fp, indent=4)
+
+
+if __name__ == "__main__":
+    main()
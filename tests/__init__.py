@@ -0,0 +1,35 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from gbn_host import GBNHost
+from network_simulator import NetworkSimulator
+
+
+class SimulatorTestCase(unittest.TestCase):
+    """Runs every test in its own temporary working directory, where the simulators it makes write their logs"""
+
+    # The host implementation and the options of the simulators made by make_simulator
+    RDTImpl = GBNHost
+    OPTIONS = {
+        "num_pkts": 40,
+        "timer_interval": 20,
+        "loss_prob": 0.1,
+        "corrupt_prob": 0.1,
+        "arrival_rate": 5,
+        "seed": 1,
+    }
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(tmp.name)
+
+    def make_simulator(self, name="sim", **options):
+        """A simulator with OPTIONS, updated with the given options"""
+        return NetworkSimulator(name, SimpleNamespace(**{**self.OPTIONS, **options}), self.RDTImpl)
+
+    def read_log(self, name, entity="A"):
+        with open(f"{name}--{entity}Sending.log") as fp:
+            return fp.read()
@@ -0,0 +1,18 @@
+import os
+from binary_trace import decode_trace
+from gbn_host import GBNHost
+from tests import SimulatorTestCase
+
+
+class TestBinaryTrace(SimulatorTestCase):
+    def test_decoded_trace_matches_text_logs(self):
+        self.make_simulator("text", num_pkts=50, trace_format="text").Simulate()
+        self.make_simulator("binary", num_pkts=50, trace_format="binary").Simulate()
+        self.assertFalse(os.path.exists("binary--ASending.log"))
+
+        decode_trace("binary", GBNHost)
+
+        for side in "AB":
+            text_log = self.read_log("text", side)
+            self.assertTrue(text_log)
+            self.assertEqual(self.read_log("binary", side), text_log)
@@ -0,0 +1,89 @@
+import unittest
+from congestion_control import FixedWindow, RenoCongestionControl
+from gbn_host import GBNHost
+from packet import PacketView
+from tests.test_gbn_host import RecordingSimulator
+
+class TestCongestionControl(unittest.TestCase):
+    def test_fixed_window(self):
+        cc = FixedWindow(8)
+        cc.on_timeout()
+        cc.on_fast_retransmit()
+        self.assertEqual(cc.window(), 8)
+
+    def test_reno(self):
+        cc = RenoCongestionControl(64)
+        self.assertEqual(cc.window(), 1)
+
+        # Slow start doubles the window every round trip
+        cc.on_ack(1)
+        cc.on_ack(2)
+        self.assertEqual(cc.window(), 4)
+
+        cc.on_fast_retransmit()
+        self.assertEqual((cc.window(), cc.ssthresh), (2, 2.0))
+
+        # Congestion avoidance grows by about one packet per window
+        cc.on_ack(2)
+        self.assertEqual(cc.window(), 2)
+        cc.on_ack(2)
+        self.assertEqual(cc.window(), 3)
+
+        cc.on_timeout()
+        self.assertEqual(cc.window(), 1)
+
+        # The window never grows beyond the host's window size
+        cc.on_ack(5000)
+        self.assertEqual(cc.window(), 64)
+
+    def test_host_respects_send_window(self):
+        simulator = RecordingSimulator()
+        host = GBNHost(simulator, 0, 10, 8, congestion_control="reno")
+        for payload in "abcdef":
+            host.receive_from_application_layer(payload)
+        self.assertEqual(len(simulator.sent), 1)
+
+        host.receive_from_network_layer(host.create_ack_pkt(0))
+        self.assertEqual(len(simulator.sent), 3)
+
+    def reno_host_with_window_of_four(self):
+        """A Reno GBN host that has grown cwnd to 4 in slow start, with packets 3 to 6 in flight"""
+        simulator = RecordingSimulator()
+        host = GBNHost(simulator, 0, 10, 8, congestion_control="reno")
+        for payload in "abcdefgh":
+            host.receive_from_application_layer(payload)
+        for seq_num in range(3):
+            host.receive_from_network_layer(host.create_ack_pkt(seq_num))
+        self.assertEqual((host.window_base, host.next_seq_num, host.send_window()), (3, 7, 4))
+        simulator.sent.clear()
+        return simulator, host
+
+    def test_reno_reacts_to_duplicate_acks(self):
+        simulator, host = self.reno_host_with_window_of_four()
+        self.assertTrue(host.fast_retransmit)
+        self.assertFalse(GBNHost(simulator, 0, 10, 8).fast_retransmit)
+
+        for _ in range(host.dup_ack_threshold):
+            host.receive_from_network_layer(host.create_ack_pkt(2))
+
+        self.assertEqual(host.congestion_control.cwnd, 2.0)
+        # Only the halved window is resent
+        self.assertEqual([PacketView(pkt).seq_num for pkt in simulator.sent], [3, 4])
+        self.assertEqual(host.fast_retransmits, 2)
+
+    def test_timeout_resends_only_the_send_window(self):
+        simulator, host = self.reno_host_with_window_of_four()
+
+        host.timer_interrupt()
+        self.assertEqual(host.send_window(), 1)
+        self.assertEqual([PacketView(pkt).seq_num for pkt in simulator.sent], [3])
+
+        # Later ACKs resend the rest of the window as cwnd grows, before any new packet
+        simulator.sent.clear()
+        host.receive_from_network_layer(host.create_ack_pkt(3))
+        self.assertEqual([PacketView(pkt).seq_num for pkt in simulator.sent], [4, 5])
+        simulator.sent.clear()
+        host.receive_from_network_layer(host.create_ack_pkt(4))
+        self.assertEqual([PacketView(pkt).seq_num for pkt in simulator.sent], [6])
+        self.assertEqual(host.timeout_retransmits, 4)
+        self.assertIsNone(host.resend_next)
@@ -0,0 +1,60 @@
+import json
+import os
+from network_simulator import ComplexEncoder, EventEntity, EventType, SimulatedEvent
+from tests import SimulatorTestCase
+
+
+class TestEventLog(SimulatorTestCase):
+    OPTIONS = {**SimulatorTestCase.OPTIONS, "num_pkts": 30, "seed": 2}
+
+    def test_json_lines_match_events_json(self):
+        events = self.make_simulator("json").Simulate()
+        self.assertIsNone(self.make_simulator("jsonl", event_log="jsonl").Simulate())
+
+        with open("json_events.json") as fp:
+            expected = json.load(fp)
+        with open("jsonl_events.jsonl") as fp:
+            actual = [json.loads(line) for line in fp]
+
+        self.assertEqual(len(expected), len(events))
+        self.assertEqual(actual, expected)
+        self.assertFalse(os.path.exists("jsonl_events.json"))
+
+    def test_iter_events_streams_processed_events(self):
+        simulator = self.make_simulator("iter")
+        num_events = 0
+        for event in simulator.iter_events():
+            self.assertEqual(simulator.time, event.evtime)
+            if event.evtype == EventType.FROM_APPLICATION_LAYER:
+                self.assertIsNotNone(event.pkt)
+            num_events += 1
+
+        self.assertEqual(simulator.nsim, 30)
+        self.assertGreater(num_events, 30)
+        self.assertTrue(simulator.A_as_sender_log.closed)
+        self.assertFalse(os.path.exists("iter_events.json"))
+
+    def test_closing_iterator_closes_logs(self):
+        simulator = self.make_simulator("closed")
+        events = simulator.iter_events()
+        next(events)
+        events.close()
+
+        self.assertTrue(simulator.A_as_sender_log.closed)
+        self.assertTrue(simulator.B_as_sender_log.closed)
+
+    def test_encoded_event_fields(self):
+        event = SimulatedEvent(1.5, EventType.FROM_NETWORK_LAYER, EventEntity.B, b"\x00\x01")
+
+        self.assertFalse(hasattr(event, "__dict__"))
+        self.assertEqual(
+            json.loads(json.dumps(event, cls=ComplexEncoder)),
+            {
+                "evtime": "1.5",
+                "evtype": "EventType.FROM_NETWORK_LAYER",
+                "eventity": "1",
+                "pkt": "b'\\x00\\x01'",
+                "previous_event": "None",
+                "next_event": "None",
+            },
+        )
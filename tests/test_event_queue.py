@@ -0,0 +1,31 @@
+import unittest
+import random
+from network_simulator import EventQueue, SimulatedEvent
+
+class TestEventQueue(unittest.TestCase):
+    def make_event(self, evtime):
+        event = SimulatedEvent()
+        event.evtime = evtime
+        return event
+
+    def test_pops_in_time_order(self):
+        queue = EventQueue()
+        times = [random.uniform(0, 100) for _ in range(200)]
+        for t in times:
+            queue.push(self.make_event(t))
+
+        popped = [queue.pop().evtime for _ in range(len(times))]
+        self.assertEqual(popped, sorted(times))
+        self.assertEqual(len(queue), 0)
+
+    def test_equal_times_are_fifo(self):
+        queue = EventQueue()
+        events = [self.make_event(5.0) for _ in range(10)]
+        queue.push(self.make_event(7.0))
+        for e in events:
+            queue.push(e)
+        queue.push(self.make_event(1.0))
+
+        self.assertEqual(queue.pop().evtime, 1.0)
+        for e in events:
+            self.assertIs(queue.pop(), e)
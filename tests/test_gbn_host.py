@@ -0,0 +1,136 @@
+import unittest
+from gbn_host import GBNHost, MAX_UNSIGNED_INT
+
+class RecordingSimulator:
+    """Stands in for NetworkSimulator and records what a host asks it to do"""
+
+    def __init__(self):
+        self.time = 0.0
+        self.sent = []
+        self.delivered = []
+        self.timers = {}
+
+    def pass_to_network_layer(self, entity, packet):
+        self.sent.append(packet)
+
+    def pass_to_application_layer(self, entity, data):
+        self.delivered.append(data)
+
+    def start_timer(self, entity, increment, handle=None):
+        self.timers.setdefault(handle, increment)
+
+    def stop_timer(self, entity, handle=None):
+        self.timers.pop(handle, None)
+
+
+class TestSendQueue(unittest.TestCase):
+    def test_backpressure(self):
+        simulator = RecordingSimulator()
+        host = GBNHost(simulator, 0, 10, 2, send_queue_high_water=3)
+        signals = []
+        host.set_backpressure_callback(signals.append)
+
+        results = [host.receive_from_application_layer(c) for c in "abcde"]
+        # Two payloads fit in the window, the third to fifth wait in the send queue
+        self.assertEqual(results, [True, True, True, True, False])
+        self.assertEqual(len(simulator.sent), 2)
+        self.assertEqual(signals, [True])
+
+        host.receive_from_network_layer(host.create_ack_pkt(0))
+        self.assertEqual(len(simulator.sent), 3)
+        self.assertEqual(list(host.app_layer_buffer), ["d", "e"])
+        self.assertEqual(signals, [True, False])
+
+
+class TestAdaptiveRTO(unittest.TestCase):
+    def test_fixed_timer_by_default(self):
+        simulator = RecordingSimulator()
+        host = GBNHost(simulator, 0, 10, 4)
+        host.receive_from_application_layer("a")
+        self.assertEqual(simulator.timers, {None: 10})
+
+    def test_rtt_estimation_and_backoff(self):
+        simulator = RecordingSimulator()
+        host = GBNHost(simulator, 0, 10, 4, adaptive_rto=True)
+        host.receive_from_application_layer("a")
+        self.assertEqual(simulator.timers, {None: 10})
+
+        simulator.time = 2.0
+        host.receive_from_network_layer(host.create_ack_pkt(0))
+        self.assertEqual((host.srtt, host.rttvar, host.rto), (2.0, 1.0, 6.0))
+
+        host.receive_from_application_layer("b")
+        self.assertEqual(simulator.timers, {None: 6.0})
+
+        # A timeout doubles the RTO, and the retransmitted packet is not sampled (Karn's rule)
+        del simulator.timers[None]
+        host.timer_interrupt()
+        self.assertEqual(simulator.timers, {None: 12.0})
+        simulator.time = 20.0
+        host.receive_from_network_layer(host.create_ack_pkt(1))
+        self.assertEqual(host.srtt, 2.0)
+        self.assertEqual(host.rto, 6.0)
+
+
+class TestFastRetransmit(unittest.TestCase):
+    def test_duplicate_acks_trigger_one_fast_retransmit(self):
+        simulator = RecordingSimulator()
+        host = GBNHost(simulator, 0, 10, 8, fast_retransmit=True)
+        for payload in "abcd":
+            host.receive_from_application_layer(payload)
+        host.receive_from_network_layer(host.create_ack_pkt(0))
+        simulator.sent.clear()
+
+        # Packet 1 was lost, so the receiver keeps re-ACKing packet 0
+        for _ in range(2):
+            host.receive_from_network_layer(host.create_ack_pkt(0))
+        self.assertEqual(simulator.sent, [])
+        host.receive_from_network_layer(host.create_ack_pkt(0))
+        self.assertEqual(len(simulator.sent), 3)
+        self.assertEqual((host.fast_retransmits, host.timeout_retransmits), (3, 0))
+
+        # Further duplicates for the same window base do not retransmit again
+        for _ in range(5):
+            host.receive_from_network_layer(host.create_ack_pkt(0))
+        self.assertEqual(len(simulator.sent), 3)
+
+        host.timer_interrupt()
+        self.assertEqual((host.fast_retransmits, host.timeout_retransmits), (3, 3))
+
+    def test_disabled_by_default(self):
+        simulator = RecordingSimulator()
+        host = GBNHost(simulator, 0, 10, 8)
+        host.receive_from_application_layer("a")
+        host.receive_from_application_layer("b")
+        simulator.sent.clear()
+        for _ in range(5):
+            host.receive_from_network_layer(host.create_ack_pkt(MAX_UNSIGNED_INT))
+        self.assertEqual(simulator.sent, [])
+
+
+class TestDelayedAck(unittest.TestCase):
+    def setUp(self):
+        self.simulator = RecordingSimulator()
+        self.host = GBNHost(self.simulator, 0, 10, 8, delayed_ack=True, ack_every=3, ack_delay=0.5)
+        self.simulator.sent.clear()
+
+    def test_ack_every_k_packets(self):
+        for seq_num in range(3):
+            self.host.receive_from_network_layer(self.host.create_data_pkt(seq_num, "x"))
+        self.assertEqual(self.simulator.sent, [self.host.create_ack_pkt(2)])
+        self.assertNotIn("delayed_ack", self.simulator.timers)
+
+    def test_ack_timer(self):
+        self.host.receive_from_network_layer(self.host.create_data_pkt(0, "x"))
+        self.assertEqual(self.simulator.sent, [])
+        self.assertEqual(self.simulator.timers, {"delayed_ack": 0.5})
+
+        del self.simulator.timers["delayed_ack"]
+        self.host.timer_interrupt("delayed_ack")
+        self.assertEqual(self.simulator.sent, [self.host.create_ack_pkt(0)])
+
+    def test_gap_acks_immediately(self):
+        self.host.receive_from_network_layer(self.host.create_data_pkt(0, "x"))
+        self.host.receive_from_network_layer(self.host.create_data_pkt(2, "x"))
+        self.assertEqual(self.simulator.sent, [self.host.create_ack_pkt(0)])
+        self.assertEqual(self.simulator.timers, {})
@@ -0,0 +1,43 @@
+import unittest
+import random
+from struct import pack
+from internet_checksum import internet_checksum, ones_complement_sum, update_checksum
+
+class TestInternetChecksum(unittest.TestCase):
+    # The word-at-a-time reference implementation the fast version must agree with
+    def reference_checksum(self, packet):
+        sum = 0
+        for i in range(0, len(packet), 2):
+            if i + 1 < len(packet):
+                word = (packet[i] << 8) + packet[i + 1]
+            else:
+                word = packet[i] << 8
+            sum = sum + word
+        while (sum >> 16) > 0:
+            sum = (sum & 0xFFFF) + (sum >> 16)
+        return ~sum & 0xFFFF
+
+    def test_matches_reference(self):
+        rng = random.Random(3600)
+        for length in range(0, 64):
+            for _ in range(20):
+                data = bytes(rng.getrandbits(8) for _ in range(length))
+                self.assertEqual(internet_checksum(data), self.reference_checksum(data), data)
+
+    def test_edge_cases(self):
+        for data in [b"", b"\x00", b"\x00\x00\x00", b"\xff\xff", b"\xff\xff\xff\xff", b"\xff", b"\x00\x01\xff\xfe"]:
+            self.assertEqual(internet_checksum(data), self.reference_checksum(data), data)
+        self.assertEqual(ones_complement_sum(b"\xff\xff\x00\x00"), 0xFFFF)
+
+    def test_incremental_update(self):
+        rng = random.Random(1624)
+        for _ in range(500):
+            old_seq = rng.getrandbits(32)
+            new_seq = rng.choice([0, 0xFFFFFFFF, rng.getrandbits(32)])
+            payload = bytes(rng.getrandbits(8) for _ in range(rng.randint(0, 9)))
+            old_pkt = pack("!HIHI%is" % len(payload), 0x0, old_seq, 0, len(payload), payload)
+            new_pkt = pack("!HIHI%is" % len(payload), 0x0, new_seq, 0, len(payload), payload)
+
+            updated = update_checksum(internet_checksum(old_pkt), old_seq, new_seq)
+            if any(new_pkt):
+                self.assertEqual(updated, self.reference_checksum(new_pkt))
@@ -0,0 +1,84 @@
+import contextlib
+import csv
+import io
+import json
+import os
+import unittest
+from metrics import LatencyHistogram, SimulationMetrics
+from tests import SimulatorTestCase
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_buckets_bound_the_relative_error(self):
+        histogram = LatencyHistogram(resolution=0.001, sub_bucket_bits=7)
+        for value in (0.005, 0.2, 3.7, 41.0, 1234.5, 98765.4321):
+            index = histogram.bucket_index(int(value / histogram.resolution))
+            low, high = histogram.bucket_bounds(index)
+            self.assertLessEqual(low, value)
+            self.assertLess(value, high)
+            self.assertLessEqual(high - low, max(histogram.resolution, value / 64))
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram(resolution=0.01)
+        for value in range(1, 101):
+            histogram.record(float(value))
+
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.mean(), 50.5)
+        self.assertAlmostEqual(histogram.percentile(50), 50, delta=50 / 64)
+        self.assertAlmostEqual(histogram.percentile(90), 90, delta=90 / 64)
+        self.assertEqual(histogram.percentile(100), 100.0)
+        self.assertEqual(sum(count for _, _, count in histogram.buckets()), 100)
+
+    def test_empty(self):
+        self.assertIsNone(LatencyHistogram().percentile(50))
+
+
+class TestSimulationMetrics(SimulatorTestCase):
+    OPTIONS = {**SimulatorTestCase.OPTIONS, "num_pkts": 200, "arrival_rate": 2, "seed": 4}
+
+    def test_metrics_of_a_run(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.make_simulator("plain").Simulate()
+            simulator = self.make_simulator("measured")
+            metrics = SimulationMetrics(simulator, sample_interval=0.5, max_samples=16)
+            simulator.Simulate()
+
+        self.assertEqual(self.read_log("measured"), self.read_log("plain"))
+
+        summary = metrics.summary()
+        delivered = len(simulator.A.data_received) + len(simulator.B.data_received)
+        self.assertEqual(summary["delivered"], delivered)
+        self.assertEqual(summary["latency"]["count"], delivered)
+        self.assertEqual(summary["out_of_order"], 0)
+        self.assertAlmostEqual(summary["goodput"], delivered / simulator.time)
+        self.assertGreater(summary["retransmission_ratio"], 0)
+        for entity in ("A", "B"):
+            self.assertLessEqual(summary["window_occupancy"][entity]["mean"], simulator.window_size)
+            self.assertLessEqual(summary["window_occupancy"][entity]["max"], simulator.window_size)
+
+        for series in metrics.occupancy_series.values():
+            self.assertLess(len(series), 16)
+            times = [t for t, _ in series]
+            self.assertEqual(times, sorted(times))
+
+    def test_export(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            simulator = self.make_simulator("export")
+            metrics = SimulationMetrics(simulator)
+            simulator.Simulate()
+        metrics.export_json("export.json")
+        metrics.export_csv("export")
+
+        with open("export.json") as fp:
+            exported = json.load(fp)
+        self.assertEqual(exported["delivered"], metrics.delivered)
+        self.assertEqual(sum(b["count"] for b in exported["latency_histogram"]), metrics.delivered)
+
+        with open("export_summary.csv") as fp:
+            rows = dict(csv.reader(fp))
+        self.assertEqual(int(rows["delivered"]), metrics.delivered)
+        self.assertIn("latency.p99", rows)
+        self.assertIn("window_occupancy.A.mean", rows)
+        for suffix in ("latency", "window"):
+            self.assertTrue(os.path.exists(f"export_{suffix}.csv"))
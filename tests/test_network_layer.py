@@ -0,0 +1,59 @@
+from network_simulator import EventEntity
+from packet import build_data_pkt
+from tests import SimulatorTestCase
+
+
+class RecordingHost:
+    def __init__(self, simulator, entity, timer_interval, window_size):
+        self.simulator = simulator
+        self.entity = entity
+        self.received = []
+
+    def receive_from_application_layer(self, payload):
+        pass
+
+    def receive_from_network_layer(self, packet):
+        self.received.append(packet)
+
+    def timer_interrupt(self, handle=None):
+        pass
+
+    def unpack_pkt(self, packet):
+        return None
+
+
+class TestNetworkLayer(SimulatorTestCase):
+    RDTImpl = RecordingHost
+    OPTIONS = {**SimulatorTestCase.OPTIONS, "num_pkts": 0, "loss_prob": 0, "corrupt_prob": 0}
+
+    def test_packets_are_passed_by_reference(self):
+        simulator = self.make_simulator()
+        packet = build_data_pkt(1, b"abcd")
+        simulator.pass_to_network_layer(EventEntity.A, packet)
+        simulator.Simulate()
+
+        self.assertEqual(len(simulator.B.received), 1)
+        self.assertIs(simulator.B.received[0], packet)
+
+    def test_sender_cannot_mutate_packet_in_flight(self):
+        simulator = self.make_simulator()
+        packet = bytearray(build_data_pkt(1, b"abcd"))
+        simulator.pass_to_network_layer(EventEntity.A, packet)
+        sent = bytes(packet)
+        packet[-1] ^= 0xFF
+        simulator.Simulate()
+
+        self.assertEqual(simulator.B.received, [sent])
+        self.assertIsInstance(simulator.B.received[0], bytes)
+
+    def test_corruption_copies_the_packet(self):
+        simulator = self.make_simulator(corrupt_prob=1)
+        packet = build_data_pkt(1, b"abcd")
+        original = bytes(bytearray(packet))
+        simulator.pass_to_network_layer(EventEntity.A, packet)
+        simulator.Simulate()
+
+        self.assertEqual(packet, original)
+        self.assertEqual(len(simulator.B.received), 1)
+        self.assertNotEqual(simulator.B.received[0], packet)
+        self.assertEqual(len(simulator.B.received[0]), len(packet))
@@ -0,0 +1,82 @@
+import unittest
+import random
+from struct import pack, unpack, error
+from gbn_host import GBNHost
+from packet import PacketView
+
+class TestPacketView(unittest.TestCase):
+    def setUp(self):
+        self.gbn = GBNHost(None, None, 10, 10)
+
+    def flip_bit(self, pkt, rng):
+        values = bytearray(pkt)
+        values[rng.randint(0, len(pkt) - 1)] ^= 1 << rng.randint(0, 7)
+        return bytes(values)
+
+    # The original repack-and-checksum corruption check the view must agree with
+    def reference_is_corrupt(self, packet):
+        try:
+            packet_type, seq_num, original_checksum = unpack("!HIH", packet[:8])
+            if packet_type == 0x1:
+                packet_without_checksum = pack("!HIH", packet_type, seq_num, 0)
+            else:
+                payload_length = unpack("!I", packet[8:12])[0]
+                payload = packet[12 : 12 + payload_length]
+                packet_without_checksum = pack("!HIHI{}s".format(len(payload)), packet_type, seq_num, 0, payload_length, payload)
+            return self.gbn.create_checksum(packet_without_checksum) != original_checksum
+        except error:
+            return True
+
+    def test_fields(self):
+        view = PacketView(self.gbn.create_data_pkt(42, "hello"))
+        self.assertEqual(view.packet_type, 0x0)
+        self.assertEqual(view.seq_num, 42)
+        self.assertEqual(view.payload_length, 5)
+        self.assertEqual(view.payload, b"hello")
+        self.assertFalse(view.is_corrupt())
+
+        view = PacketView(self.gbn.create_ack_pkt(7))
+        self.assertTrue(view.is_ack())
+        self.assertEqual(view.as_dict(), {"packet_type": 0x1, "seq_num": 7, "checksum": view.checksum})
+
+    def test_short_packets(self):
+        self.assertRaises(error, PacketView, b"\x00\x01")
+        self.assertIsNone(self.gbn.unpack_pkt(b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x09abc"))
+        self.assertTrue(self.gbn.is_corrupt(b"\x00\x00\x00"))
+
+    def test_matches_reference_under_corruption(self):
+        rng = random.Random(5)
+        for i in range(2000):
+            if i % 2:
+                pkt = self.gbn.create_ack_pkt(rng.getrandbits(32))
+            else:
+                pkt = self.gbn.create_data_pkt(rng.getrandbits(32), "x" * rng.randint(0, 8))
+            for _ in range(rng.randint(0, 2)):
+                pkt = self.flip_bit(pkt, rng)
+            self.assertEqual(self.gbn.is_corrupt(pkt), self.reference_is_corrupt(pkt), pkt)
+
+
+class TestPacketBuilder(unittest.TestCase):
+    def setUp(self):
+        self.gbn = GBNHost(None, None, 10, 10)
+
+    # The original pack, checksum, repack construction
+    def reference_data_pkt(self, seq_num, payload):
+        pkt = pack("!HIHI{}s".format(len(payload)), 0x0, seq_num, 0, len(payload), payload.encode())
+        checksum = self.gbn.create_checksum(pkt)
+        return pack("!HIHI{}s".format(len(payload)), 0x0, seq_num, checksum, len(payload), payload.encode())
+
+    def reference_ack_pkt(self, seq_num):
+        checksum = self.gbn.create_checksum(pack("!HIH", 0x1, seq_num, 0))
+        return pack("!HIH", 0x1, seq_num, checksum)
+
+    def test_matches_reference(self):
+        rng = random.Random(6)
+        for seq_num in [0, 1, 0xFFFE, 0xFFFF, 0x10000, 0xFFFFFFFF] + [rng.getrandbits(32) for _ in range(200)]:
+            payload = "".join(chr(rng.randint(0, 127)) for _ in range(rng.randint(0, 9)))
+            self.assertEqual(self.gbn.create_data_pkt(seq_num, payload), self.reference_data_pkt(seq_num, payload))
+            self.assertEqual(self.gbn.create_ack_pkt(seq_num), self.reference_ack_pkt(seq_num))
+
+    def test_all_zero_packet(self):
+        self.assertEqual(self.gbn.create_data_pkt(0, ""), self.reference_data_pkt(0, ""))
+        self.assertEqual(self.gbn.create_data_pkt(0, "\0"), self.reference_data_pkt(0, "\0"))
@@ -0,0 +1,33 @@
+import contextlib
+import io
+from gbn_host import GBNHost
+from rdt_tester import RDTTester
+from tests import SimulatorTestCase
+
+TESTS = [
+    "Test1_SlowDataRate_0Loss_0Corruption",
+    "Test4_SlowDataRate_25Loss_25Corruption",
+    "Test8_MediumDataRate_10Loss_10Corruption",
+]
+
+
+class TestParallelRunner(SimulatorTestCase):
+    def run_tests(self, jobs):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            results = RDTTester(GBNHost).run_tests(TESTS, jobs=jobs)
+
+        logs = {}
+        for test in TESTS:
+            logs[test] = self.read_log(test)
+        return results, output.getvalue(), logs
+
+    def test_parallel_run_matches_serial_run(self):
+        serial = self.run_tests(jobs=1)
+        parallel = self.run_tests(jobs=2)
+
+        self.assertEqual([r["test"] for r in parallel[0]], TESTS)
+        self.assertTrue(all(r["passed"] for r in parallel[0]))
+        self.assertEqual(parallel[0], serial[0])
+        self.assertEqual(parallel[1], serial[1])
+        self.assertEqual(parallel[2], serial[2])
@@ -0,0 +1,35 @@
+import contextlib
+import io
+from profiling import SimulationProfiler
+from tests import SimulatorTestCase
+
+
+class TestProfiling(SimulatorTestCase):
+    OPTIONS = {**SimulatorTestCase.OPTIONS, "seed": 3}
+
+    def test_profile_counts_every_event(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            events = self.make_simulator("plain").Simulate()
+            simulator = self.make_simulator("profiled")
+            profiler = SimulationProfiler(simulator)
+            profiled_events = profiler.run()
+
+        self.assertEqual(self.read_log("profiled"), self.read_log("plain"))
+        self.assertEqual(len(profiled_events), len(events))
+
+        report = profiler.report()
+        counts = {name: stats["count"] for name, stats in report["event_types"].items()}
+        self.assertEqual(sum(counts.values()), len(events))
+        self.assertEqual(counts["FROM_APPLICATION_LAYER"], 40)
+        self.assertGreater(report["max_queue_depth"], 0)
+
+        for stats in report["event_types"].values():
+            self.assertEqual(stats["total_ns"], stats["host_ns"] + stats["simulator_ns"])
+            self.assertGreaterEqual(stats["host_ns"], 0)
+            self.assertLessEqual(stats["log_ns"], stats["simulator_ns"])
+
+    def test_unprofiled_simulator_is_not_wrapped(self):
+        simulator = self.make_simulator("plain")
+
+        self.assertNotIn("pass_to_network_layer", vars(simulator))
+        self.assertNotIn("receive_from_network_layer", vars(simulator.A))
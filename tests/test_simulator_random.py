@@ -0,0 +1,37 @@
+import contextlib
+import io
+import random
+from network_simulator import run_simulations
+from tests import SimulatorTestCase
+
+
+class TestSimulatorRandom(SimulatorTestCase):
+    OPTIONS = {**SimulatorTestCase.OPTIONS, "loss_prob": 0.2, "corrupt_prob": 0.2}
+
+    def test_simulator_does_not_touch_global_random(self):
+        random.seed(99)
+        expected = [random.random() for _ in range(5)]
+
+        random.seed(99)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.make_simulator("sim", seed=1).Simulate()
+        self.assertEqual([random.random() for _ in range(5)], expected)
+
+    def test_global_random_gives_the_same_run(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            own = self.make_simulator("own", seed=7).Simulate()
+            shared = self.make_simulator("shared", seed=7, global_random=True).Simulate()
+
+        self.assertEqual([e.evtime for e in own], [e.evtime for e in shared])
+        self.assertEqual(self.read_log("own"), self.read_log("shared"))
+
+    def test_interleaved_simulators_match_separate_runs(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for seed in (1, 2, 3):
+                self.make_simulator(f"alone{seed}", seed=seed).Simulate()
+            simulators = [self.make_simulator(f"together{seed}", seed=seed) for seed in (1, 2, 3)]
+            errors = run_simulations(simulators)
+
+        self.assertEqual(errors, [None, None, None])
+        for seed in (1, 2, 3):
+            self.assertEqual(self.read_log(f"together{seed}"), self.read_log(f"alone{seed}"))
@@ -0,0 +1,103 @@
+import contextlib
+import io
+import json
+import os
+import re
+import unittest
+import sr_host
+from gbn_host import GBNHost
+from network_simulator import NetworkSimulator
+from packet import PacketView
+from rdt_tester import RDTTester
+from sr_host import SRHost
+from tests import SimulatorTestCase
+from tests.test_gbn_host import RecordingSimulator
+
+TEST_CASES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_cases")
+
+class TestSRHost(unittest.TestCase):
+    def setUp(self):
+        self.simulator = RecordingSimulator()
+        self.host = SRHost(self.simulator, 0, 10, 4)
+
+    def sent_seq_nums(self):
+        return [PacketView(pkt).seq_num for pkt in self.simulator.sent]
+
+    def test_out_of_order_delivery(self):
+        for seq_num in [1, 2, 0, 3]:
+            self.host.receive_from_network_layer(self.host.create_data_pkt(seq_num, str(seq_num)))
+
+        self.assertEqual(self.simulator.delivered, ["0", "1", "2", "3"])
+        # Every packet is ACKed individually
+        self.assertEqual(self.sent_seq_nums(), [1, 2, 0, 3])
+        self.assertEqual(self.host.expected_seq_num, 4)
+
+    def test_duplicate_is_reacked_not_redelivered(self):
+        self.host.receive_from_network_layer(self.host.create_data_pkt(0, "a"))
+        self.host.receive_from_network_layer(self.host.create_data_pkt(0, "a"))
+        self.assertEqual(self.simulator.delivered, ["a"])
+        self.assertEqual(self.sent_seq_nums(), [0, 0])
+        # The re-ACK reuses the ACK packet built for the first copy
+        self.assertIs(self.simulator.sent[1], self.simulator.sent[0])
+        self.assertEqual((self.host.ack_cache_hits, self.host.ack_cache_misses), (1, 1))
+
+    def test_single_loss_single_retransmission(self):
+        for payload in "abcd":
+            self.host.receive_from_application_layer(payload)
+        self.assertEqual(sorted(self.simulator.timers), [0, 1, 2, 3])
+
+        # Packet 1 is lost, the others are ACKed
+        for seq_num in [0, 2, 3]:
+            self.host.receive_from_network_layer(self.host.create_ack_pkt(seq_num))
+        self.assertEqual(self.host.window_base, 1)
+        self.assertEqual(list(self.simulator.timers), [1])
+
+        self.simulator.sent.clear()
+        del self.simulator.timers[1]
+        self.host.timer_interrupt(1)
+        self.assertEqual(self.sent_seq_nums(), [1])
+
+        self.host.receive_from_network_layer(self.host.create_ack_pkt(1))
+        self.assertEqual(self.host.window_base, 4)
+        self.assertEqual(self.simulator.timers, {})
+
+    def test_ack_cache_eviction(self):
+        for seq_num in range(sr_host.ACK_CACHE_SIZE + 1):
+            self.assertEqual(self.host.get_ack_pkt(seq_num), self.host.create_ack_pkt(seq_num))
+        self.assertEqual(len(self.host.ack_cache), sr_host.ACK_CACHE_SIZE)
+        self.assertNotIn(0, self.host.ack_cache)
+
+    def test_timeout_backs_off_per_packet(self):
+        self.host.receive_from_application_layer("a")
+        self.host.receive_from_application_layer("b")
+        for expected in (20, 40, 80):
+            del self.simulator.timers[0]
+            self.host.timer_interrupt(0)
+            self.assertEqual(self.simulator.timers[0], expected)
+        # Packet 1 keeps its own timeout
+        self.assertEqual(self.simulator.timers[1], 10)
+
+
+class TestSRScaledScenarios(SimulatorTestCase):
+    def simulate(self, test, RDTImpl, num_pkts):
+        with open(os.path.join(TEST_CASES, f"{test}.cfg")) as fp:
+            args = re.findall(r'(?:[^\s,"]|"(?:\\.|[^"])*")+', json.load(fp)["options"])
+        options, _ = RDTTester(RDTImpl).op.parse_args(args + ["--num_pkts", str(num_pkts), "--event_log", "none"])
+        with contextlib.redirect_stdout(io.StringIO()):
+            simulator = NetworkSimulator(RDTImpl.__name__, options, RDTImpl)
+            events = simulator.iter_events()
+            for num_events, _ in enumerate(events):
+                if num_events > 50 * num_pkts:
+                    events.close()
+                    self.fail(f"{RDTImpl.__name__} had not finished {test} after {num_events} events")
+        return simulator
+
+    def test_scaled_up_scenarios_drain(self):
+        # With a fixed timeout, packets queued in the channel used to be resent every interval and the run never ended
+        for test in ("Test5_MediumDataRate_0Loss_0Corruption", "Test12_FastDataRate_10Loss_10Corruption"):
+            with self.subTest(test=test):
+                gbn = self.simulate(test, GBNHost, 1000)
+                sr = self.simulate(test, SRHost, 1000)
+
+                self.assertEqual(len(sr.A.data_received) + len(sr.B.data_received), 1000)
+                self.assertLessEqual(sr.ntolayer3, 2 * gbn.ntolayer3)
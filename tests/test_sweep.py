@@ -0,0 +1,64 @@
+import glob
+import math
+import os
+import unittest
+from gbn_host import GBNHost
+from rdt_tester import RDTTester
+from sweep import MonteCarloSweep, summarize
+
+OPTIONS = "--num_pkts 30 --arrival_rate 1 --timer_interval 20 --loss_prob 0.1 --corrupt_prob 0.1"
+
+
+class TestSweep(unittest.TestCase):
+    def test_summarize(self):
+        summary = summarize([1.0, 2.0, 3.0, 4.0])
+
+        self.assertEqual(summary["mean"], 2.5)
+        self.assertAlmostEqual(summary["stdev"], math.sqrt(5 / 3))
+        # t(0.975, 3) = 3.182
+        self.assertAlmostEqual(summary["half_width"], 3.182 * math.sqrt(5 / 3) / 2)
+        self.assertEqual(summarize([1.0])["half_width"], math.inf)
+
+    def test_cells_stop_once_precise(self):
+        sweep = MonteCarloSweep(
+            GBNHost, {"loss_prob": [0.0, 0.2], "window_size": [4]}, OPTIONS, min_runs=3, max_runs=20, precision=10
+        )
+        results = sweep.run()
+
+        self.assertEqual([(r["loss_prob"], r["window_size"]) for r in results], [(0.0, 4), (0.2, 4)])
+        for result in results:
+            self.assertEqual(result["runs"], 5)
+            self.assertTrue(result["converged"])
+
+    def test_cells_stop_at_max_runs(self):
+        sweep = MonteCarloSweep(
+            GBNHost, {"timer_interval": [10]}, OPTIONS, min_runs=2, max_runs=7, precision=0, batch_size=3
+        )
+        (result,) = sweep.run()
+
+        self.assertEqual(result["runs"], 7)
+        self.assertFalse(result["converged"])
+        self.assertGreater(result["goodput"]["mean"], 0)
+
+    def test_same_seeds_give_same_results(self):
+        grid = {"arrival_rate": [1, 5]}
+        first = MonteCarloSweep(GBNHost, grid, OPTIONS, min_runs=4, max_runs=4).run()
+        second = MonteCarloSweep(GBNHost, grid, OPTIONS, min_runs=4, max_runs=4, batch_size=1).run()
+
+        self.assertEqual(first, second)
+
+    def test_unknown_parameter(self):
+        with self.assertRaises(ValueError):
+            MonteCarloSweep(GBNHost, {"seed": [1, 2]}, OPTIONS)
+
+
+class TestWindowSweep(unittest.TestCase):
+    def test_sweep_leaves_no_logs(self):
+        logs = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Logs")
+        before = set(glob.glob(os.path.join(logs, "WindowSweep_*")))
+
+        results = RDTTester(GBNHost).sweep_window_sizes(OPTIONS + " --seed 1", [1, 4])
+
+        self.assertEqual([r["window_size"] for r in results], [1, 4])
+        self.assertTrue(all(r["delivered"] == 30 for r in results))
+        self.assertEqual(set(glob.glob(os.path.join(logs, "WindowSweep_*"))), before)
@@ -0,0 +1,55 @@
+from network_simulator import EventEntity
+from tests import SimulatorTestCase
+
+class TimerHost:
+    def __init__(self, simulator, entity, timer_interval, window_size):
+        self.simulator = simulator
+        self.entity = entity
+        self.fired = []
+
+    def receive_from_application_layer(self, payload):
+        pass
+
+    def receive_from_network_layer(self, packet):
+        pass
+
+    def timer_interrupt(self, handle=None):
+        self.fired.append((self.simulator.time, handle))
+
+
+class TestTimers(SimulatorTestCase):
+    RDTImpl = TimerHost
+
+    def setUp(self):
+        super().setUp()
+        self.simulator = self.make_simulator("timers", num_pkts=0)
+
+    def test_multiple_timers_per_entity(self):
+        self.simulator.start_timer(EventEntity.A, 3)
+        self.simulator.start_timer(EventEntity.A, 1, handle=7)
+        self.simulator.start_timer(EventEntity.A, 2, handle=8)
+        self.simulator.Simulate()
+
+        self.assertEqual(self.simulator.A.fired, [(1, 7), (2, 8), (3, None)])
+
+    def test_stopped_timer_does_not_fire(self):
+        self.simulator.start_timer(EventEntity.A, 1, handle=1)
+        self.simulator.start_timer(EventEntity.A, 2, handle=2)
+        self.simulator.stop_timer(EventEntity.A, handle=1)
+        self.assertFalse(self.simulator.timer_running(EventEntity.A, 1))
+        self.assertTrue(self.simulator.timer_running(EventEntity.A, 2))
+
+        events = self.simulator.Simulate()
+
+        self.assertEqual(self.simulator.A.fired, [(2, 2)])
+        self.assertEqual(len(events), 1)
+
+    def test_restarted_timer_fires_once(self):
+        self.simulator.start_timer(EventEntity.B, 1)
+        self.simulator.stop_timer(EventEntity.B)
+        self.simulator.start_timer(EventEntity.B, 5)
+        # A second start while running is ignored
+        self.simulator.start_timer(EventEntity.B, 2)
+        self.simulator.Simulate()
+
+        self.assertEqual(self.simulator.B.fired, [(5, None)])
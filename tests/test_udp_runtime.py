@@ -0,0 +1,42 @@
+import asyncio
+import contextlib
+import io
+import unittest
+from gbn_host import GBNHost
+from sr_host import SRHost
+from udp_runtime import run_transfer
+
+
+class TestUDPRuntime(unittest.TestCase):
+    def transfer(self, RDTHost, loss_prob, corrupt_prob):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return asyncio.run(
+                run_transfer(
+                    RDTHost,
+                    num_pkts=40,
+                    arrival_rate=1,
+                    timer_interval=20,
+                    loss_prob=loss_prob,
+                    corrupt_prob=corrupt_prob,
+                    time_scale=0.001,
+                    seed=1,
+                    timeout=20,
+                )
+            )
+
+    def test_clean_channel(self):
+        result = self.transfer(GBNHost, 0, 0)
+
+        self.assertEqual(result["delivered"], 40)
+        self.assertEqual(result["latency"]["count"], 40)
+        self.assertGreaterEqual(result["num_data_sent"], 40)
+        self.assertGreater(result["throughput"], 0)
+
+    def test_impaired_channel(self):
+        for RDTHost in (GBNHost, SRHost):
+            with self.subTest(RDTHost=RDTHost.__name__):
+                result = self.transfer(RDTHost, 0.2, 0.2)
+
+                self.assertEqual(result["delivered"], 40)
+                self.assertGreater(result["num_data_sent"], 40)
+                self.assertGreater(result["retransmission_ratio"], 0)
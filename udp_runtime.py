@@ -0,0 +1,411 @@
+"""Runs the RDT hosts over real UDP sockets on localhost, under an asyncio event loop
+
+A host only uses four routines of the simulator: pass_to_network_layer, pass_to_application_layer, start_timer and
+stop_timer (plus the current time). UDPHostRuntime provides them on top of a UDP socket (an asyncio DatagramProtocol)
+and loop.call_later timers, so the unmodified GBNHost or SRHost code can exchange real datagrams.
+
+The two hosts do not talk to each other directly but through an ImpairmentProxy, normally run in a process of its
+own. The proxy applies the simulator's channel model to every datagram it forwards: it is lost with probability
+loss_prob, has a random bit flipped with probability corrupt_prob, and is otherwise delayed by 0.1 to 1 time units
+after the previous datagram in the same direction, so that datagrams are never reordered.
+
+Times are measured in the same units as the simulator's, so that timer_interval means the same thing to a host in
+both. time_scale sets how many seconds of wall-clock time a unit lasts.
+
+Usage:
+    python udp_runtime.py [--num_pkts N] [--loss_prob X] [--corrupt_prob X] [--time_scale S] [--protocol gbn|sr]
+    python udp_runtime.py --proxy_only --listen_port P --a_port P --b_port P [--loss_prob X] [--corrupt_prob X]
+"""
+
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import random
+import time
+from optparse import OptionParser
+
+from metrics import LatencyHistogram
+from network_simulator import DEFAULT_WINDOW_SIZE, PACKET_TYPE, EventEntity
+
+LOCALHOST = "127.0.0.1"
+
+
+class UDPHostRuntime(asyncio.DatagramProtocol):
+    """Gives a host the simulator interface on top of a UDP socket
+
+    Args:
+        RDTHost (class): the host implementation
+        entity (EventEntity): which entity the host is
+        remote_addr (tuple): the (host, port) that all of the host's packets are sent to
+        timer_interval (float): the host's timer interval, in time units
+        window_size (int): the host's window size
+        time_scale (float): the length of a time unit in seconds
+        on_deliver (callable): called with (entity, data) whenever the host passes data to the application layer
+        host_options: the optional host arguments, e.g. adaptive_rto
+    """
+
+    def __init__(
+        self,
+        RDTHost,
+        entity,
+        remote_addr,
+        timer_interval,
+        window_size,
+        time_scale,
+        on_deliver=None,
+        **host_options,
+    ):
+        self.entity = entity
+        self.remote_addr = remote_addr
+        self.time_scale = time_scale
+        self.on_deliver = on_deliver
+        self.transport = None
+        self.loop = asyncio.get_running_loop()
+        self.start = self.loop.time()
+
+        # Timer handles (asyncio.TimerHandle) of the running timers, keyed by the host's timer handle
+        self.timers = {}
+
+        self.num_data_sent = 0
+        self.num_ack_sent = 0
+
+        self.host = RDTHost(self, entity, timer_interval, window_size, **host_options)
+
+    @property
+    def time(self):
+        return (self.loop.time() - self.start) / self.time_scale
+
+    # asyncio.DatagramProtocol
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.host.receive_from_network_layer(data)
+
+    # The routines called by the host
+
+    def pass_to_network_layer(self, entity, packet):
+        if PACKET_TYPE.unpack_from(packet)[0] == 0x1:
+            self.num_ack_sent += 1
+        else:
+            self.num_data_sent += 1
+        self.transport.sendto(bytes(packet), self.remote_addr)
+
+    def pass_to_application_layer(self, entity, data):
+        if self.on_deliver is not None:
+            self.on_deliver(entity, data)
+
+    def start_timer(self, entity, increment, handle=None):
+        if handle in self.timers:
+            return
+        self.timers[handle] = self.loop.call_later(increment * self.time_scale, self.fire_timer, handle)
+
+    def stop_timer(self, entity, handle=None):
+        timer = self.timers.pop(handle, None)
+        if timer is not None:
+            timer.cancel()
+
+    def timer_running(self, entity, handle=None):
+        return handle in self.timers
+
+    def fire_timer(self, handle):
+        del self.timers[handle]
+        if handle is None:
+            self.host.timer_interrupt()
+        else:
+            self.host.timer_interrupt(handle)
+
+    def close(self):
+        for timer in self.timers.values():
+            timer.cancel()
+        self.timers.clear()
+        if self.transport is not None:
+            self.transport.close()
+
+
+class ImpairmentProxy(asyncio.DatagramProtocol):
+    """Forwards datagrams between two hosts through the simulator's channel model
+
+    Datagrams from a_addr are forwarded to b_addr and the other way around; anything else is dropped.
+
+    Args:
+        a_addr (tuple): the address of host A
+        b_addr (tuple): the address of host B
+        loss_prob (float): the probability that a datagram is lost
+        corrupt_prob (float): the probability that one bit of a datagram is flipped
+        time_scale (float): the length of a time unit in seconds
+        seed (int): the seed of the proxy's random generator
+    """
+
+    def __init__(self, a_addr, b_addr, loss_prob, corrupt_prob, time_scale, seed=None):
+        self.routes = {a_addr: b_addr, b_addr: a_addr}
+        self.loss_prob = loss_prob
+        self.corrupt_prob = corrupt_prob
+        self.time_scale = time_scale
+        self.random = random.Random(seed)
+        self.transport = None
+        self.loop = asyncio.get_running_loop()
+
+        # Latest scheduled delivery time (loop time) towards each address, so that datagrams are never reordered
+        self.channel_tail = {}
+
+        self.forwarded = 0
+        self.lost = 0
+        self.corrupted = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        destination = self.routes.get(addr)
+        if destination is None:
+            return
+
+        if self.random.uniform(0.0, 1.0) < self.loss_prob:
+            self.lost += 1
+            return
+
+        now = self.loop.time()
+        last_time = max(now, self.channel_tail.get(destination, now))
+        arrival = last_time + (0.1 + 0.9 * self.random.uniform(0.0, 1.0)) * self.time_scale
+        self.channel_tail[destination] = arrival
+
+        if self.random.uniform(0.0, 1.0) < self.corrupt_prob:
+            self.corrupted += 1
+            values = bytearray(data)
+            values[self.random.randint(0, len(values) - 1)] ^= 1 << self.random.randint(0, 7)
+            data = bytes(values)
+
+        self.forwarded += 1
+        self.loop.call_at(arrival, self.transport.sendto, data, destination)
+
+
+async def serve_proxy(listen_port, a_addr, b_addr, loss_prob, corrupt_prob, time_scale, seed=None, ready=None):
+    """Runs an ImpairmentProxy until cancelled. ready, if given, is called with the port the proxy listens on."""
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: ImpairmentProxy(a_addr, b_addr, loss_prob, corrupt_prob, time_scale, seed),
+        local_addr=(LOCALHOST, listen_port),
+    )
+    if ready is not None:
+        ready(transport.get_extra_info("sockname")[1])
+    try:
+        await asyncio.Future()
+    finally:
+        transport.close()
+
+
+def proxy_process(connection, a_addr, b_addr, loss_prob, corrupt_prob, time_scale, seed):
+    """The body of the proxy process started by run_transfer: reports its port through connection, then serves"""
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(
+            serve_proxy(0, a_addr, b_addr, loss_prob, corrupt_prob, time_scale, seed, ready=connection.send)
+        )
+
+
+async def run_transfer(
+    RDTHost,
+    num_pkts,
+    arrival_rate,
+    timer_interval,
+    loss_prob,
+    corrupt_prob,
+    window_size=DEFAULT_WINDOW_SIZE,
+    time_scale=0.001,
+    seed=None,
+    timeout=60.0,
+    **host_options,
+):
+    """Sends num_pkts messages between two hosts over UDP, through an impairment proxy process
+
+    Messages are generated like the simulator generates them: every arrival_rate time units on average, at a random
+    host, with a payload of 2 to 5 copies of a letter.
+
+    Returns:
+        dict: "delivered", "wall_time" (seconds from the first message to the last delivery), "throughput"
+            (messages delivered per second), "latency" (a LatencyHistogram summary of the one-way delivery latency in
+            seconds), "num_data_sent", "num_ack_sent" and "retransmission_ratio"
+    """
+    loop = asyncio.get_running_loop()
+    rng = random.Random(seed)
+
+    latency = LatencyHistogram(resolution=1e-6)
+    sent = {EventEntity.A: [], EventEntity.B: []}
+    delivered = {EventEntity.A: 0, EventEntity.B: 0}
+    done = loop.create_future()
+    last_delivery = None
+
+    def on_deliver(entity, data):
+        nonlocal last_delivery
+        source = EventEntity.B if entity == EventEntity.A else EventEntity.A
+        idx = delivered[source]
+        if idx < len(sent[source]) and sent[source][idx][1] == data:
+            latency.record(loop.time() - sent[source][idx][0])
+        delivered[source] += 1
+        last_delivery = loop.time()
+        if sum(delivered.values()) >= num_pkts and not done.done():
+            done.set_result(None)
+
+    # Bind both hosts first, so that the proxy can be told where they are
+    runtimes = {}
+    transports = []
+    for entity in EventEntity:
+        transport, runtime = await loop.create_datagram_endpoint(
+            lambda entity=entity: UDPHostRuntime(
+                RDTHost, entity, None, timer_interval, window_size, time_scale, on_deliver, **host_options
+            ),
+            local_addr=(LOCALHOST, 0),
+        )
+        runtimes[entity] = runtime
+        transports.append(transport)
+    a_addr = transports[0].get_extra_info("sockname")[:2]
+    b_addr = transports[1].get_extra_info("sockname")[:2]
+
+    # A forked child would inherit this process's running event loop, so the proxy process is spawned instead
+    context = multiprocessing.get_context("spawn")
+    parent, child = context.Pipe()
+    proxy = context.Process(
+        target=proxy_process,
+        args=(child, a_addr, b_addr, loss_prob, corrupt_prob, time_scale, seed),
+        daemon=True,
+    )
+    proxy.start()
+    try:
+        proxy_port = await loop.run_in_executor(None, parent.recv)
+        for runtime in runtimes.values():
+            runtime.remote_addr = (LOCALHOST, proxy_port)
+
+        start = loop.time()
+        for idx in range(num_pkts):
+            await asyncio.sleep(arrival_rate * rng.uniform(0.0, 1.0) * 2 * time_scale)
+            entity = EventEntity.A if rng.uniform(0.0, 1.0) > 0.5 else EventEntity.B
+            payload = chr(97 + idx % 26) * rng.randint(2, 5)
+            sent[entity].append((loop.time(), payload))
+            runtimes[entity].host.receive_from_application_layer(payload)
+
+        try:
+            await asyncio.wait_for(done, timeout)
+        except asyncio.TimeoutError:
+            pass
+    finally:
+        for runtime in runtimes.values():
+            runtime.close()
+        proxy.terminate()
+        proxy.join()
+
+    num_data_sent = sum(runtime.num_data_sent for runtime in runtimes.values())
+    num_delivered = sum(delivered.values())
+    wall_time = (last_delivery - start) if last_delivery is not None else 0.0
+    return {
+        "delivered": num_delivered,
+        "wall_time": wall_time,
+        "throughput": num_delivered / wall_time if wall_time else 0.0,
+        "latency": latency.summary(),
+        "num_data_sent": num_data_sent,
+        "num_ack_sent": sum(runtime.num_ack_sent for runtime in runtimes.values()),
+        "retransmission_ratio": (num_data_sent - num_pkts) / num_pkts if num_pkts else 0.0,
+    }
+
+
+def main():
+    from rdt_tester import PROTOCOLS
+
+    op = OptionParser(description="Runs the RDT hosts over UDP on localhost through an impairment proxy")
+    op.add_option("--num_pkts", metavar="X", type="int", default=1000, help="messages to send [default: %default]")
+    op.add_option(
+        "--arrival_rate",
+        metavar="X",
+        type="float",
+        default=1.0,
+        help="average time units between messages [default: %default]",
+    )
+    op.add_option("--timer_interval", metavar="X", type="float", default=20.0, help="[default: %default]")
+    op.add_option("--loss_prob", metavar="X", type="float", default=0.0, help="[default: %default]")
+    op.add_option("--corrupt_prob", metavar="X", type="float", default=0.0, help="[default: %default]")
+    op.add_option("--window_size", metavar="X", type="int", default=DEFAULT_WINDOW_SIZE, help="[default: %default]")
+    op.add_option(
+        "--time_scale",
+        metavar="S",
+        type="float",
+        default=0.001,
+        help="seconds of wall-clock time per time unit [default: %default]",
+    )
+    op.add_option("--seed", metavar="X", type="int", help="the seed for message generation and the proxy")
+    op.add_option(
+        "--timeout",
+        metavar="S",
+        type="float",
+        default=60.0,
+        help="give up this many seconds after the last message [default: %default]",
+    )
+    op.add_option(
+        "--protocol",
+        type="choice",
+        choices=sorted(PROTOCOLS),
+        default="gbn",
+        help="the host implementation [default: %default]",
+    )
+    op.add_option("--verbose", action="store_true", help="show the hosts' output")
+    op.add_option("--proxy_only", action="store_true", help="only run an impairment proxy, until interrupted")
+    op.add_option("--listen_port", metavar="P", type="int", default=0, help="the proxy's port (--proxy_only)")
+    op.add_option("--a_port", metavar="P", type="int", help="host A's port on localhost (--proxy_only)")
+    op.add_option("--b_port", metavar="P", type="int", help="host B's port on localhost (--proxy_only)")
+    options, _ = op.parse_args()
+
+    if options.proxy_only:
+        if options.a_port is None or options.b_port is None:
+            op.error("--proxy_only needs --a_port and --b_port")
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(
+                serve_proxy(
+                    options.listen_port,
+                    (LOCALHOST, options.a_port),
+                    (LOCALHOST, options.b_port),
+                    options.loss_prob,
+                    options.corrupt_prob,
+                    options.time_scale,
+                    options.seed,
+                    ready=lambda port: print(f"Impairment proxy listening on {LOCALHOST}:{port}"),
+                )
+            )
+        return
+
+    transfer = run_transfer(
+        PROTOCOLS[options.protocol],
+        options.num_pkts,
+        options.arrival_rate,
+        options.timer_interval,
+        options.loss_prob,
+        options.corrupt_prob,
+        window_size=options.window_size,
+        time_scale=options.time_scale,
+        seed=options.seed,
+        timeout=options.timeout,
+    )
+    start = time.perf_counter()
+    if options.verbose:
+        result = asyncio.run(transfer)
+    else:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            result = asyncio.run(transfer)
+    elapsed = time.perf_counter() - start
+
+    print(f"Delivered {result['delivered']} of {options.num_pkts} messages in {result['wall_time']:.3f}s "
+          f"({elapsed:.3f}s including setup)")
+    print(f"Throughput: {result['throughput']:.1f} messages/s")
+    latency = result["latency"]
+    if latency["count"]:
+        print(
+            "Latency (ms): "
+            + ", ".join(f"{name} {latency[name] * 1000:.3f}" for name in ("min", "mean", "p50", "p90", "p99", "max"))
+        )
+    print(
+        f"Data packets sent: {result['num_data_sent']} (retransmission ratio {result['retransmission_ratio']:.3f}), "
+        f"ACKs sent: {result['num_ack_sent']}"
+    )
+
+
+if __name__ == "__main__":
+    main()